@@ -0,0 +1,122 @@
+"""
+End-to-end run of the parallel crawl driver against the local stand-in for the site.
+
+Crawls a channel and a user with yt_dlp_plugins.hypnotube.crawl from bench/server.py, with every number of
+worker processes given. The flaky scenario runs against a server on which every second listing page fails
+with a 500 the first time it is requested, which the crawl has to retry; the missing scenario runs against
+one that answers the pages after the last one with a 404, which has to end the listing. Every scenario
+checks that the merged output lists exactly the items that single yt-dlp extractions of the same listings
+give, in the same order, and that no task failed; it reports the requests the server answered and the wall
+time. Scenarios with an unreliable server also check that single yt-dlp extractions against it list the same
+items as against a reliable one. Exits with status 1 on any mismatch. Runs offline:
+
+    python bench/bench_crawl.py [--workers N ...] [--scenario NAME ...] [--pages N]
+
+The workers are forked, so that they inherit the routing of hypnotube.com to the local server.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import yt_dlp
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_extractors import BenchServer, BenchYoutubeDL, extract  # noqa: E402
+from yt_dlp_plugins.hypnotube import crawl  # noqa: E402
+
+SOURCES = ['https://hypnotube.com/channels/38/hd/', 'https://hypnotube.com/user/ambersis-3082/']
+
+# name: (crawl options, server.py options)
+SCENARIOS = {
+    'entries': ([], []),
+    'entries-flaky': ([], ['--flaky-pages', '2']),
+    'entries-missing': ([], ['--missing-pages']),
+    'items': (['--items'], []),
+}
+
+
+class CrawlYoutubeDL(BenchYoutubeDL):
+    """Created by the crawl workers in place of yt_dlp.YoutubeDL"""
+    server_url = None
+
+    def __init__(self, params):
+        super().__init__(self.server_url, params)
+
+
+def expected_items(server):
+    """(ie_key, id) of every listed item in the order the crawl merges them, each only once"""
+    seen, items = set(), []
+    for url in crawl.expand_sources(SOURCES):
+        for entry in extract(server, url, {})['entries']:
+            key = entry and (entry['ie_key'], entry['id'])
+            if key and key not in seen:
+                seen.add(key)
+                items.append(key)
+    return items
+
+
+def run_crawl(server, crawl_args, workers, tmpdir):
+    db, output = os.path.join(tmpdir, 'crawl.sqlite'), os.path.join(tmpdir, 'crawl.ndjson')
+    for path in (db, f'{db}-wal', f'{db}-shm', output):
+        if os.path.exists(path):
+            os.remove(path)
+    CrawlYoutubeDL.server_url = server.url
+    start = time.perf_counter()
+    with mock.patch.object(yt_dlp, 'YoutubeDL', CrawlYoutubeDL), contextlib.redirect_stderr(io.StringIO()) as log:
+        status = crawl.main([
+            '--workers', str(workers), '--db', db, '-o', output, '--quiet', '--no-warnings', '--no-cache-dir',
+            *crawl_args, *SOURCES])
+    wall = time.perf_counter() - start
+    with open(output, encoding='utf-8') as f:
+        results = [json.loads(line) for line in f]
+    return status, log.getvalue(), results, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--workers', type=int, action='append', help='worker processes, may be repeated (default: 1 and 4)')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='only run these scenarios')
+    parser.add_argument('--pages', type=int, default=5, help='pages of every listing (default: %(default)s)')
+    args = parser.parse_args()
+    multiprocessing.set_start_method('fork')
+
+    with BenchServer('--pages', str(args.pages)) as server:
+        expected = expected_items(server)
+
+    errors = []
+    print(f'{"scenario":<16}{"workers":>8}{"items":>7}{"requests":>10}{"wall ms":>10}')
+    with tempfile.TemporaryDirectory(prefix='hypnotube-bench-') as tmpdir:
+        for name in args.scenario or SCENARIOS:
+            crawl_args, server_args = SCENARIOS[name]
+            if server_args:
+                with BenchServer('--pages', str(args.pages), *server_args) as server:
+                    if expected_items(server) != expected:
+                        errors.append(f'{name}: a yt-dlp extraction lists other items than with a reliable server')
+            for workers in args.workers or [1, 4]:
+                with BenchServer('--pages', str(args.pages), *server_args) as server:
+                    status, log, results, wall = run_crawl(server, crawl_args, workers, tmpdir)
+                    requests = server.pop_stats()['requests']
+                print(f'{name:<16}{workers:>8}{len(results):>7}{requests:>10}{wall * 1e3:>10.0f}')
+
+                key = 'extractor_key' if '--items' in crawl_args else 'ie_key'
+                if status:
+                    errors.append(f'{name} with {workers} workers: {log.strip()}')
+                if [(result.get(key), result.get('id')) for result in results] != expected:
+                    errors.append(f'{name} with {workers} workers: other items than a yt-dlp extraction lists')
+
+    for error in errors:
+        print(f'MISMATCH {error}')
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
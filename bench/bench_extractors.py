@@ -0,0 +1,225 @@
+"""
+End-to-end benchmark of every Hypnotube extractor against a local stand-in for the site.
+
+Each scenario extracts one URL the way yt-dlp does (flat playlists, no downloads) from bench/server.py,
+which serves the saved pages in bench/fixtures, so it runs offline and the numbers only depend on the code.
+For every scenario it reports the requests issued, the bytes received, the CPU time of the extraction
+(parsing, mostly; the server runs in its own process), the wall time and the peak memory allocated.
+All numbers but memory are the median of --rounds runs; memory is traced in one extra run.
+A first, unmeasured run of every scenario warms up lazy imports and caches.
+
+    python bench/bench_extractors.py [--rounds N] [--scenario NAME ...]
+    python bench/bench_extractors.py --save baseline.json
+    python bench/bench_extractors.py --compare baseline.json [--threshold 0.2]
+
+--compare exits with status 1 if any number of a scenario grew by more than the threshold. Requests and bytes
+are medians too because prefetching past the end of a listing may take one request more or less.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+
+from yt_dlp import YoutubeDL
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from yt_dlp_plugins.extractor import _hypnotube  # noqa: E402
+
+EXTRACTORS = [
+    _hypnotube.HypnotubeVideoIE,
+    _hypnotube.HypnotubeGalleryIE,
+    _hypnotube.HypnotubeChannelsIE,
+    _hypnotube.HypnotubeUserIE,
+    _hypnotube.HypnotubePlaylistIE,
+    _hypnotube.HypnotubeFavoritesIE,
+]
+
+# name: (URL, extra YoutubeDL params)
+SCENARIOS = {
+    'video': ('https://hypnotube.com/video/ocean-drift-induction-40912.html', {}),
+    'video-legacy-player': ('https://hypnotube.com/video/ocean-drift-induction-40913.html', {}),
+    'video-comments': ('https://hypnotube.com/video/ocean-drift-induction-40912.html', {'getcomments': True}),
+    'video-probe-filesize': ('https://hypnotube.com/video/ocean-drift-induction-40912.html', {
+        'extractor_args': {'hypnotube': {'probe_filesize': ['true']}}}),
+    'gallery': ('https://hypnotube.com/galleries/spiral-collection-7311.html', {}),
+    'gallery-thumbnails': ('https://hypnotube.com/galleries/spiral-collection-7311.html', {
+        'extractor_args': {'hypnotube': {'gallery_thumbnails': ['true']}}}),
+    'channel': ('https://hypnotube.com/channels/38/hd/', {}),
+    'channel-playlist-items': ('https://hypnotube.com/channels/38/hd/', {'playlist_items': '1-5'}),
+    'user': ('https://hypnotube.com/user/ambersis-3082/', {}),
+    'playlist': ('https://hypnotube.com/playlist/12/evening-sessions/', {}),
+    'favorites-login': ('https://hypnotube.com/favorites/', {'username': 'benchuser', 'password': 'bench'}),
+}
+
+METRICS = [
+    # key, column, unit scale
+    ('requests', 'requests', 1),
+    ('bytes', 'KiB', 1024),
+    ('cpu', 'cpu ms', 1e-3),
+    ('wall', 'wall ms', 1e-3),
+    ('peak', 'peak KiB', 1024),
+]
+# Differences below these are noise whatever the threshold
+NOISE_FLOOR = {'cpu': 2e-3, 'wall': 5e-3, 'peak': 256 * 1024}
+
+_HYPNOTUBE_URL_RE = re.compile(r'^https?://(?:[\w-]+\.)?hypnotube\.com(?=/|$)')
+
+
+class BenchYoutubeDL(YoutubeDL):
+    """Sends every hypnotube.com request to the local server, and makes the responses look like the site's"""
+
+    def __init__(self, server_url, params):
+        self._server_url = server_url
+        super().__init__(params, auto_init=False)
+        for ie in EXTRACTORS:
+            self.add_info_extractor(ie())
+
+    def urlopen(self, req):
+        req = req.copy() if isinstance(req, Request) else Request(req)
+        req.url = _HYPNOTUBE_URL_RE.sub(self._server_url, req.url)
+        try:
+            response = super().urlopen(req)
+        except HTTPError as e:
+            # Extractors read the responses of expected error statuses, such as 304, too
+            self._restore_url(e.response)
+            raise
+        return self._restore_url(response)
+
+    def _restore_url(self, response):
+        if response.url.startswith(self._server_url):
+            response.url = 'https://hypnotube.com' + response.url[len(self._server_url):]
+        return response
+
+
+class BenchServer:
+    def __init__(self, *args):
+        self._args = args  # Command line options of server.py
+
+    def __enter__(self):
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(__file__), 'server.py'), *self._args],
+            stdout=subprocess.PIPE, text=True)
+        self.url = re.search(r'http://[^/]+', self._process.stdout.readline()).group(0)
+        return self
+
+    def __exit__(self, *args):
+        self._process.terminate()
+        self._process.wait()
+
+    def pop_stats(self):
+        with urllib.request.urlopen(f'{self.url}/__bench__/stats') as response:
+            return json.load(response)
+
+
+def _reset_process_state():
+    # Probe again in every round, as a new yt-dlp process would; every round logs in with its own cookie jar
+    with _hypnotube._FORMAT_PROBES_LOCK:
+        _hypnotube._FORMAT_PROBES.clear()
+
+
+def extract(server, url, params):
+    _reset_process_state()
+    with BenchYoutubeDL(server.url, {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+        'extract_flat': 'in_playlist',
+        'cachedir': False,
+        **params,
+    }) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if not info:
+        raise RuntimeError(f'No result for {url}')
+    return info
+
+
+def run_scenario(server, url, params, rounds):
+    # Lazy imports and first-use setup are not counted
+    extract(server, url, params)
+    server.pop_stats()
+
+    runs = []
+    for _ in range(rounds):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        info = extract(server, url, params)
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        stats = server.pop_stats()
+        runs.append({'requests': stats['requests'], 'bytes': stats['bytes'], 'cpu': cpu, 'wall': wall})
+
+    tracemalloc.start()
+    try:
+        extract(server, url, params)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    server.pop_stats()
+
+    return {
+        'entries': len(info['entries']) if 'entries' in info else None,
+        **{key: statistics.median(run[key] for run in runs) for key in runs[0]},
+        'peak': peak,
+    }
+
+
+def print_results(results):
+    print(f'{"scenario":<22}{"entries":>8}' + ''.join(f'{column:>11}' for _, column, _ in METRICS))
+    for name, result in results.items():
+        line = f'{name:<22}{"-" if result["entries"] is None else result["entries"]:>8}'
+        for key, _, scale in METRICS:
+            line += f'{result[key] / scale:>11.{0 if scale == 1 else 1}f}'
+        print(line)
+
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key, column, scale in METRICS:
+            old, new = baseline[name][key], result[key]
+            if new > old * (1 + threshold) and new - old > NOISE_FLOOR.get(key, 0):
+                regressions.append(f'{name}: {column} {old / scale:.1f} -> {new / scale:.1f}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=5, help='timed runs per scenario (default: %(default)s)')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='only run these scenarios')
+    parser.add_argument('--save', metavar='FILE', help='write the results to FILE as a baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results with the baseline in FILE')
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='relative increase counted as a regression (default: %(default)s)')
+    args = parser.parse_args()
+
+    results = {}
+    with BenchServer() as server:
+        for name in args.scenario or SCENARIOS:
+            url, params = SCENARIOS[name]
+            results[name] = run_scenario(server, url, params, max(args.rounds, 1))
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions against {args.compare}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Import-time cost of the plugin for a yt-dlp run that does not involve Hypnotube.
+
+yt-dlp loads every plugin on startup. This starts yt-dlp the way a run does, creating a YoutubeDL and
+matching a non-Hypnotube URL against all extractors, in fresh interpreters with -X importtime: --rounds
+times with the plugins in --plugin-dir, and as often with YTDLP_NO_PLUGINS=1. It reports the median startup
+time of both, the modules only the plugin run imported with their import time, and whether the extractor
+implementation was imported. Run it against an older checkout with --plugin-dir to compare:
+
+    python bench/bench_import.py [--rounds N] [--plugin-dir PATH]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+STARTUP = '''
+import json, sys, time
+start = time.perf_counter()
+from yt_dlp import YoutubeDL
+ydl = YoutubeDL({'quiet': True})
+matches = [ie.ie_key() for ie in ydl._ies.values() if ie.suitable('https://www.youtube.com/watch?v=BaW_jenozKc')]
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'plugin_modules': sorted(name for name in sys.modules if name.startswith('yt_dlp_plugins.')),
+}))
+'''
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(?P<self>\d+) \|\s+\d+ \|\s*(?P<name>\S+)$')
+
+
+def run_startup(plugin_dir, plugins):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [plugin_dir, os.environ.get('PYTHONPATH')])))
+    env.pop('YTDLP_NO_PLUGINS', None)
+    if not plugins:
+        env['YTDLP_NO_PLUGINS'] = '1'
+    # Run outside of the repository, so that only PYTHONPATH makes the plugins importable
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP], env=env, cwd=os.path.expanduser('~'),
+        capture_output=True, text=True, check=True)
+    imports = {}  # module -> microseconds spent importing the module itself
+    for line in process.stderr.splitlines():
+        if mobj := _IMPORTTIME_RE.match(line):
+            imports[mobj.group('name')] = int(mobj.group('self'))
+    return json.loads(process.stdout.splitlines()[-1]), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=10, help='interpreter starts per variant (default: %(default)s)')
+    parser.add_argument(
+        '--plugin-dir', default=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+        help='directory containing yt_dlp_plugins (default: this checkout)')
+    args = parser.parse_args()
+
+    with_plugins, without_plugins, extra_imports = [], [], {}
+    for _ in range(max(args.rounds, 1)):
+        # Alternate the variants so that both see the same disk cache and CPU frequency
+        result, imports = run_startup(args.plugin_dir, plugins=True)
+        with_plugins.append(result['seconds'])
+        baseline, baseline_imports = run_startup(args.plugin_dir, plugins=False)
+        without_plugins.append(baseline['seconds'])
+        for name in imports.keys() - baseline_imports.keys():
+            extra_imports.setdefault(name, []).append(imports[name])
+
+    print(f'Plugin modules loaded: {", ".join(result["plugin_modules"]) or "none"}')
+    median_with, median_without = statistics.median(with_plugins), statistics.median(without_plugins)
+    print(f'Startup without plugins: {median_without * 1e3:8.1f} ms')
+    print(f'Startup with plugins:    {median_with * 1e3:8.1f} ms ({(median_with - median_without) * 1e3:+.1f} ms)')
+    # A module that only some of the runs imported was not imported because of the plugin
+    extra_imports = {
+        name: statistics.median(times) for name, times in extra_imports.items() if len(times) == len(with_plugins)}
+    total = sum(extra_imports.values())
+    print(f'Modules only imported with plugins: {len(extra_imports)}, {total / 1e3:.1f} ms')
+    for name, microseconds in sorted(extra_imports.items(), key=lambda item: -item[1])[:15]:
+        print(f'  {microseconds / 1e3:8.2f} ms  {name}')
+    print(f'Extractor implementation imported: {"yt_dlp_plugins.extractor._hypnotube" in result["plugin_modules"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Equivalence check and micro-benchmark for video and gallery page parsing.
+
+Compares the per-field lookups the extractors used to do, each one a search of a full html.parser DOM,
+with the single pass of HypnotubeBaseIE._parse_item_page that the extractors now use, on the saved item
+pages in bench/fixtures. Both are fed through the same field helpers and must give identical fields;
+exits with status 1 if they do not. Runs offline:
+
+    python bench/bench_item_page.py [--rounds N]
+"""
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import ExtractorError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from yt_dlp_plugins.extractor._hypnotube import (  # noqa: E402
+    _UPLOADER_URL_RE,
+    HypnotubeVideoIE,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+ITEM_FIXTURES = [
+    'watch_plyr.html',
+    'watch_thisplayer.html',
+    'watch_notice.html',
+    'gallery.html',
+    'gallery_image.html',
+]
+URL = 'https://hypnotube.com/video/ocean-drift-induction-40912.html'
+
+
+def find_fields(webpage):
+    """The previous implementation: a full DOM, then one search of the whole tree per field"""
+    soup = BeautifulSoup(webpage, 'html.parser')
+    return {
+        'title': soup.find('h1'),
+        'thumbnail': soup.find('meta', property='og:image'),
+        'uploader': soup.find('a', href=_UPLOADER_URL_RE),
+        'plyr_player': soup.find('video', id='plyr_player'),
+        'thisPlayer': soup.find('video', id='thisPlayer'),
+        'notice_overl': soup.find(id='notice_overl'),
+        'playerOverlay': soup.find(id='playerOverlay'),
+        'description': soup.find('div', class_='main-description'),
+        'stats': soup.find('div', class_='stats-container'),
+        'gallery_items': soup.select('.gallery-item-col'),
+    }
+
+
+IE = HypnotubeVideoIE(YoutubeDL({'quiet': True}))
+
+
+def parse_fields(webpage):
+    return IE._parse_item_page(webpage)
+
+
+def field_values(page):
+    """What the extractors take from the elements of a page"""
+    try:
+        formats = IE._extract_formats(page, URL)
+    except ExtractorError as e:
+        formats = e.orig_msg
+    return {
+        'title': IE._extract_title(page),
+        'description': IE._extract_description(page),
+        'thumbnail': IE._extract_thumbnail(page),
+        'uploader': IE._extract_uploader_info(page),
+        'stats': IE._extract_video_stats(page),
+        'formats': formats,
+        'gallery_images': [img['src'] for item in page['gallery_items'] for img in item.select('a img')],
+    }
+
+
+def cpu_time(func, webpage, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        func(webpage)
+    return (time.process_time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=100, help='parses per fixture (default: %(default)s)')
+    args = parser.parse_args()
+
+    print(f'{"fixture":<24}{"fields":>7}{"find ms":>10}{"parse ms":>10}{"speedup":>9}')
+    for name in ITEM_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            webpage = f.read()
+        values, expected = field_values(parse_fields(webpage)), field_values(find_fields(webpage))
+        if values != expected:
+            differing = ', '.join(key for key in expected if values[key] != expected[key])
+            sys.exit(f'{name}: single-pass parse and per-field lookups disagree on {differing}')
+        find_time = cpu_time(find_fields, webpage, args.rounds)
+        parse_time = cpu_time(parse_fields, webpage, args.rounds)
+        found = sum(1 for value in values.values() if value not in (None, [], 'Untitled'))
+        print(f'{name:<24}{found:>7}{find_time * 1000:>10.3f}{parse_time * 1000:>10.3f}{find_time / parse_time:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for listing page link extraction.
+
+Compares the full BeautifulSoup walk the listing extractors used to do with
+a plain scan for the item links that _scan_listing_tiles also matches, and
+with the tile scan of HypnotubeBaseIE._scan_listing_tiles that the extractors
+now use, on the saved listing pages in bench/fixtures. The link scan has to
+find the same links as BeautifulSoup, and the tile scan one tile per run of
+links to the same item; exits with status 1 if they do not. Runs offline:
+
+    python bench/bench_listing.py [--rounds N]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import unescapeHTML
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from yt_dlp_plugins.extractor._hypnotube import (  # noqa: E402
+    _LISTING_LINK_RE,
+    HypnotubeChannelsIE,
+    HypnotubeGalleryIE,
+    HypnotubeVideoIE,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+LISTING_FIXTURES = ['channel_page.html']
+
+
+def soup_links(webpage):
+    """The previous implementation: a full DOM, then every <a href> matched against both _VALID_URLs"""
+    soup = BeautifulSoup(webpage, 'html.parser')
+    combined_links = []
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if re.match(HypnotubeVideoIE._VALID_URL, href):
+            combined_links.append((href, HypnotubeVideoIE.ie_key()))
+        elif re.match(HypnotubeGalleryIE._VALID_URL, href):
+            combined_links.append((href, HypnotubeGalleryIE.ie_key()))
+    return combined_links
+
+
+IE = HypnotubeChannelsIE(YoutubeDL({'quiet': True}))
+
+
+def scan_links(webpage):
+    """The regex scan for item links that the tile scan starts with, without building a DOM"""
+    ie_keys = {'video': HypnotubeVideoIE.ie_key(), 'galleries': HypnotubeGalleryIE.ie_key()}
+    return [(unescapeHTML(mobj.group('url')), ie_keys[mobj.group('kind')])
+            for mobj in _LISTING_LINK_RE.finditer(webpage)]
+
+
+def scan_tiles(webpage):
+    return list(IE._scan_listing_tiles(webpage))
+
+
+def tile_links(links):
+    """What the tile scan gives for links: consecutive links to the same item are one tile"""
+    return [link for idx, link in enumerate(links) if not idx or link != links[idx - 1]]
+
+
+def cpu_time(func, webpage, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        func(webpage)
+    return (time.process_time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=200, help='parses per fixture (default: %(default)s)')
+    args = parser.parse_args()
+
+    print(f'{"fixture":<24}{"links":>7}{"soup ms":>10}{"scan ms":>10}{"speedup":>9}{"tiles ms":>10}{"speedup":>9}')
+    for name in LISTING_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            webpage = f.read()
+        links = scan_links(webpage)
+        if links != soup_links(webpage):
+            sys.exit(f'{name}: regex scan and BeautifulSoup disagree on the extracted links')
+        if [(tile['url'], tile['ie_key']) for tile in scan_tiles(webpage)] != tile_links(links):
+            sys.exit(f'{name}: tile scan and regex scan disagree on the listed items')
+        soup_time = cpu_time(soup_links, webpage, args.rounds)
+        scan_time = cpu_time(scan_links, webpage, args.rounds)
+        tiles_time = cpu_time(scan_tiles, webpage, args.rounds)
+        print(f'{name:<24}{len(links):>7}{soup_time * 1000:>10.3f}{scan_time * 1000:>10.3f}{soup_time / scan_time:>8.1f}x'
+              f'{tiles_time * 1000:>10.3f}{soup_time / tiles_time:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
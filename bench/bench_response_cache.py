@@ -0,0 +1,86 @@
+"""
+Check of the response cache against the local stand-in for the site.
+
+Extracts a channel listing and the comments of a video from bench/server.py three times, sharing one fresh
+cache directory: with nothing cached, then with the server answering every conditional request with
+304 Not Modified, then from a server that sends neither ETag nor Last-Modified, so that only the content
+hash tells that the pages did not change. After every run it compares the not modified, unchanged and miss
+counts of the response cache with the responses the server sent, checks that the bytes the cache saved are
+the bytes the server did not have to send, and that the entries are the same as in the first run.
+Exits with status 1 on any mismatch. Runs offline:
+
+    python bench/bench_response_cache.py [--pages N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_extractors import BenchServer, extract  # noqa: E402
+from yt_dlp_plugins.extractor._hypnotube import _ResponseCache  # noqa: E402
+
+CHANNEL_URL = 'https://hypnotube.com/channels/38/hd/'
+VIDEO_URL = 'https://hypnotube.com/video/ocean-drift-induction-40912.html'
+# The metadata cache would skip the watch page, and with it the comments request; prefetching may or may
+# not request a second page past the end of the listing, which would change the bytes sent from run to run
+PARAMS = {'getcomments': True, 'extractor_args': {'hypnotube': {'metadata_cache': ['off'], 'prefetch': ['0']}}}
+
+
+def run(server, cachedir):
+    with _ResponseCache._stats_lock:
+        _ResponseCache._stats.clear()
+    params = {**PARAMS, 'cachedir': cachedir}
+    entries = [entry['id'] for entry in extract(server, CHANNEL_URL, params)['entries']]
+    comments = len(extract(server, VIDEO_URL, params)['comments'])
+    with _ResponseCache._stats_lock:
+        cache_stats = dict(_ResponseCache._stats)
+    return entries, comments, cache_stats, server.pop_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5, help='pages of the channel listing (default: %(default)s)')
+    args = parser.parse_args()
+
+    cached = args.pages + 1  # Listing pages and the comments; the watch page and redirects are never cached
+    # name, server.py options, expected outcomes
+    runs = [
+        ('cold', [], {'miss': cached}),
+        ('not modified', [], {'not modified': cached}),
+        ('no validators', ['--no-validators'], {'unchanged': cached}),
+    ]
+    errors, first_run = [], None
+    print(f'{"run":<16}{"not modified":>14}{"unchanged":>11}{"misses":>8}{"304s":>6}{"KiB sent":>10}{"KiB saved":>11}')
+    with tempfile.TemporaryDirectory(prefix='hypnotube-bench-') as cachedir:
+        for name, server_args, expected in runs:
+            with BenchServer('--pages', str(args.pages), *server_args) as server:
+                entries, comments, cache_stats, server_stats = run(server, cachedir)
+            if first_run is None:
+                first_run = entries, comments, server_stats['bytes']
+
+            outcomes = {key: cache_stats.get(key, 0) for key in ('not modified', 'unchanged', 'miss')}
+            not_modified_responses = server_stats['statuses'].get('304', 0)
+            saved = cache_stats.get('bytes saved', 0)
+            print(f'{name:<16}{outcomes["not modified"]:>14}{outcomes["unchanged"]:>11}{outcomes["miss"]:>8}'
+                  f'{not_modified_responses:>6}{server_stats["bytes"] / 1024:>10.1f}{saved / 1024:>11.1f}')
+
+            if outcomes != {key: expected.get(key, 0) for key in outcomes}:
+                errors.append(f'{name}: expected {expected}, the response cache counted {outcomes}')
+            if not_modified_responses != outcomes['not modified']:
+                errors.append(f'{name}: the server sent {not_modified_responses} 304 responses, '
+                              f'the response cache counted {outcomes["not modified"]}')
+            if saved != first_run[2] - server_stats['bytes']:
+                errors.append(f'{name}: {saved} bytes saved, but the server sent '
+                              f'{first_run[2] - server_stats["bytes"]} bytes less than in the first run')
+            if (entries, comments) != first_run[:2]:
+                errors.append(f'{name}: different entries or comments than in the first run')
+
+    for error in errors:
+        print(f'MISMATCH {error}')
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Local stand-in for hypnotube.com, serving the saved pages in bench/fixtures.
+
+Routes the paths the extractors request to fixtures:
+
+    /video/...-ID.html                      watch page; IDs in LEGACY_VIDEO_IDS use the old thisPlayer layout
+    /galleries/...-ID.html[?image=N]        gallery page, or the single image view with every image URL
+    /templates/.../ajax_comments.php?id=ID  comments AJAX response
+    /channels/ID/NAME/pageN.html, /uploads-by-user/ID/pageN.html[?photos=1],
+    /playlist/ID/SLUG/[pageN.html], /favorites/pageN.html
+                                            listing pages; item IDs differ on every page, and pages after
+                                            the last one redirect to the home page like the site does
+    /login, /my-profile                     a login form that accepts any account, and its profile page
+    *.mp4, *.jpg                            media of a fixed size, answering HEAD and Range requests
+
+Every other path is a 404. Pages are served with an ETag and a Last-Modified date, and conditional requests
+for them are answered with 304 Not Modified; --no-validators leaves both out, like servers that only send
+full responses. --flaky-pages N makes every Nth page of a listing fail with a 500 the first time it is
+requested; --missing-pages answers pages after the last one with a 404 instead of a redirect. Request counts, response bytes and statuses are served as JSON on /__bench__/stats, which
+resets them. bench_extractors.py starts this server; to run it on its own:
+
+    python bench/server.py [--port 8080] [--pages N] [--no-validators] [--flaky-pages N] [--missing-pages]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+LEGACY_VIDEO_IDS = {'40913'}
+LISTING_PAGES = 5
+MEDIA_SIZE = 1024 * 1024
+SESSION_COOKIE = 'PHPSESSID=bench'
+LAST_MODIFIED = 'Sat, 18 Oct 2025 08:00:00 GMT'
+
+_LISTING_PATH_RE = re.compile(r'''(?x)^/(?:
+    channels/\d+/[^/]+|uploads-by-user/\d+|playlist/\d+/[^/]+|favorites)
+    /(?:page(?P<page>\d+)\.html)?$''')
+_ITEM_ID_RE = re.compile(r'(?P<prefix>hypnotube\.com/(?:video|galleries)/[^"\']*?-|/tmb/|/galleries/)(?P<id>\d+)')
+
+
+def _fixture(name, cache={}):
+    if name not in cache:
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            cache[name] = f.read()
+    return cache[name]
+
+
+def _listing_page(page_num):
+    """The saved channel page, with item IDs shifted so that every page lists different items"""
+    return _ITEM_ID_RE.sub(
+        lambda m: f'{m.group("prefix")}{int(m.group("id")) + (page_num - 1) * 1000}', _fixture('channel_page.html'))
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests, self.bytes, self.statuses = 0, 0, {}
+
+    def add(self, status, size):
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def pop(self):
+        with self.lock:
+            stats = {'requests': self.requests, 'bytes': self.bytes, 'statuses': self.statuses}
+            self.reset()
+            return stats
+
+
+class HypnotubeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'nginx'
+    pages = LISTING_PAGES
+    validators = True
+    flaky_pages = 0
+    missing_pages = False
+    stats = _Stats()
+    _failed_paths = set()  # Flaky pages that already failed once
+    _failed_paths_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode())
+        if self.path == '/login' and form.get('ahd_username'):
+            self._send(200, _fixture('profile.html'), headers={'Set-Cookie': f'{SESSION_COOKIE}; Path=/'})
+        else:
+            self._send(404, 'Not Found')
+
+    def _handle(self, send_body=True):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/__bench__/stats':
+            return self._send(200, json.dumps(self.stats.pop()), 'application/json', counted=False)
+
+        if mobj := re.fullmatch(r'/video/(?:.*-)?(?P<id>\d+)\.html', url.path):
+            name = 'watch_thisplayer.html' if mobj.group('id') in LEGACY_VIDEO_IDS else 'watch_plyr.html'
+            return self._send(200, _fixture(name), send_body=send_body)
+        if re.fullmatch(r'/galleries/(?:.*-)?\d+\.html', url.path):
+            name = 'gallery_image.html' if 'image' in query else 'gallery.html'
+            return self._send(200, _fixture(name), send_body=send_body)
+        if url.path == '/templates/hypnotube/template.ajax_comments.php' and 'id' in query:
+            return self._send(200, _fixture('comments.html'), send_body=send_body)
+        if mobj := _LISTING_PATH_RE.match(url.path):
+            page_num = int(mobj.group('page') or 1)
+            if page_num > self.pages:
+                if self.missing_pages:
+                    return self._send(404, 'Not Found', send_body=send_body)
+                return self._redirect('/')
+            if self.flaky_pages and page_num % self.flaky_pages == 0 and self._fail_once(self.path):
+                return self._send(500, 'Internal Server Error', send_body=send_body)
+            return self._send(200, _listing_page(page_num), send_body=send_body)
+        if url.path == '/my-profile':
+            if SESSION_COOKIE not in (self.headers.get('Cookie') or ''):
+                return self._redirect('/login')
+            return self._send(200, _fixture('profile.html'), send_body=send_body)
+        if url.path in ('/', '/login'):
+            return self._send(200, '<html><body><h1>HypnoTube</h1></body></html>', send_body=send_body)
+        if url.path.endswith(('.mp4', '.jpg')):
+            return self._send_media(send_body)
+        self._send(404, 'Not Found', send_body=send_body)
+
+    def _fail_once(self, path):
+        with self._failed_paths_lock:
+            if path in self._failed_paths:
+                return False
+            self._failed_paths.add(path)
+            return True
+
+    def _redirect(self, location):
+        self._send(302, '', headers={'Location': location})
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8', headers={}, send_body=True, counted=True):
+        data = body.encode()
+        if status == 200 and counted and self.validators:
+            etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+            headers = {**headers, 'ETag': etag, 'Last-Modified': LAST_MODIFIED}
+            if_none_match = self.headers.get('If-None-Match')
+            if (if_none_match == etag if if_none_match
+                    else self.headers.get('If-Modified-Since') == LAST_MODIFIED):
+                status, data = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if status != 304:
+            self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+        if counted:
+            self.stats.add(status, len(data) if send_body else 0)
+
+    def _send_media(self, send_body):
+        content_type = 'video/mp4' if self.path.split('?')[0].endswith('.mp4') else 'image/jpeg'
+        mobj = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range') or '')
+        start, end = (int(mobj.group(1)), int(mobj.group(2) or MEDIA_SIZE - 1)) if mobj else (0, MEDIA_SIZE - 1)
+        end = min(end, MEDIA_SIZE - 1)
+        self.send_response(206 if mobj else 200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start + 1))
+        if mobj:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{MEDIA_SIZE}')
+        self.end_headers()
+        size = 0
+        if send_body:
+            size = end - start + 1
+            self.wfile.write(b'\0' * size)
+        self.stats.add(206 if mobj else 200, size)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients going away mid-request, like crawl workers exiting with a prefetch in flight, are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=0, help='port to listen on, 0 for any free one (default)')
+    parser.add_argument('--pages', type=int, default=LISTING_PAGES, help='pages of every listing (default: %(default)s)')
+    parser.add_argument(
+        '--no-validators', dest='validators', action='store_false',
+        help='send neither ETag nor Last-Modified, and no 304 responses')
+    parser.add_argument(
+        '--flaky-pages', type=int, default=0, metavar='N',
+        help='fail every Nth listing page with a 500 on its first request (default: never)')
+    parser.add_argument(
+        '--missing-pages', action='store_true',
+        help='answer listing pages after the last one with a 404 instead of redirecting to the home page')
+    args = parser.parse_args()
+
+    HypnotubeHandler.pages = args.pages
+    HypnotubeHandler.validators = args.validators
+    HypnotubeHandler.flaky_pages = args.flaky_pages
+    HypnotubeHandler.missing_pages = args.missing_pages
+    server = _Server(('127.0.0.1', args.port), HypnotubeHandler)
+    print(f'Serving on http://127.0.0.1:{server.server_port}/', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
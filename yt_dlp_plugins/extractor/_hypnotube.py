@@ -0,0 +1,1851 @@
+import atexit
+import bisect
+import collections
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import math
+import os
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import urllib.request
+import weakref
+from bs4 import BeautifulSoup, SoupStrainer
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.networking import HEADRequest, Request
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+from yt_dlp.utils import (
+    ExtractorError,
+    InAdvancePagedList,
+    OnDemandPagedList,
+    PlaylistEntries,
+    clean_html,
+    filter_dict,
+    format_bytes,
+    int_or_none,
+    mimetype2ext,
+    parse_duration,
+    str_to_int,
+    unescapeHTML,
+    unified_timestamp,
+    url_or_none,
+    urlencode_postdata
+)
+from urllib.parse import urlparse, urlunparse
+
+from . import Hypnotube as _lazy
+
+
+class _HypnotubeSession:
+    """Login state of one cookie jar, shared by the Hypnotube extractors of every YoutubeDL using it"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.account = None  # Login name the cookie jar is authenticated as
+        self.username = None  # Display name of the logged in user, as shown by the site
+
+
+# Keyed by cookie jar, since that is what a login authenticates; a new YoutubeDL has to log in again
+_SESSIONS = weakref.WeakKeyDictionary()
+_SESSIONS_LOCK = threading.Lock()
+
+_UPLOADER_URL_RE = re.compile(r'https?://hypnotube\.com/user/.*-(?P<id>\d+)/')
+# Absolute video and gallery links, the only thing listing pages are scanned for
+_LISTING_LINK_RE = re.compile(r'''(?x)
+    <a\s[^>]*?\bhref\s*=\s*(?P<q>["'])
+    (?P<url>https?://(?:www\.)?hypnotube\.com/(?P<kind>video|galleries)/(?:[^"'\#]*-)?(?P<id>\d+)\.html[^"']*)
+    (?P=q)[^>]*>''')
+# Metadata shown on a listing tile, searched for between an item's first link and the next item's
+_TILE_MAX_LENGTH = 4096
+_TILE_IMG_RE = re.compile(r'<img\s[^>]*>')
+_TILE_ATTR_RE = re.compile(r'''\b(?P<name>title|alt|src|data-src)\s*=\s*(?P<q>["'])(?P<value>.*?)(?P=q)''')
+_TILE_DURATION_RE = re.compile(r'''class\s*=\s*["'][^"']*\b(?:time|duration)\b[^"']*["'][^>]*>\s*(?P<duration>\d+(?::\d{2}){1,2})\s*<''')
+_TILE_VIEWS_RE = re.compile(r'(?P<views>\d[\d,.]*)\s*views\b', re.IGNORECASE)
+_LOGIN_ERROR_RE = re.compile(r'<div class="notification error">The login information you have provided was incorrect', re.IGNORECASE)
+_COMMENT_AUTHOR_URL_RE = re.compile(r'user/([a-zA-Z0-9_-]+)-(\d+)/')
+_GALLERY_IMAGE_PARAM_RE = re.compile(r'\?image=\d+')
+_GALLERY_IMAGE_URL_RE = re.compile(r"images\.push\('(https?://[^\']+)'")
+
+
+@functools.cache
+def _html_parser():
+    """lxml builds the tree several times faster than html.parser, but it is an optional dependency"""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return 'html.parser'
+    return 'lxml'
+
+
+class _ItemPageStrainer(SoupStrainer):
+    """Only builds the parts of a video or gallery page that HypnotubeBaseIE._parse_item_page reads"""
+    _TAGS = ('h1', 'video')
+    _IDS = ('notice_overl', 'playerOverlay')
+    _CLASSES = {'main-description', 'stats-container', 'gallery-item-col'}
+
+    def _wanted(self, name, attrs):
+        attrs = attrs or {}
+        if name in self._TAGS or attrs.get('id') in self._IDS:
+            return True
+        if name == 'meta':
+            return attrs.get('property') == 'og:image'
+        if name == 'a':
+            return bool(_UPLOADER_URL_RE.search(attrs.get('href') or ''))
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        return not self._CLASSES.isdisjoint(classes.split())
+
+    def allow_tag_creation(self, nsprefix, name, attrs):  # bs4 >= 4.13
+        return self._wanted(name, attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):  # bs4 < 4.13
+        return self._wanted(markup_name, markup_attrs)
+
+
+_REQUEST_POOL = None  # Shared pool for requests that do not depend on each other, see HypnotubeBaseIE._submit
+_REQUEST_POOL_LOCK = threading.Lock()
+
+
+class _HostScheduler:
+    """Limits the number of concurrent requests per host, adapting the limit to what the host tolerates
+
+    The limit grows by one after a limit's worth of successful requests (additive increase) and is halved
+    whenever the host throttles, times out or resets connections (multiplicative decrease). Requests that were already running
+    when the limit was halved cannot halve it again. A Retry-After pauses the whole host.
+    """
+    _INITIAL_LIMIT = 2
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._hosts = {}
+
+    def _state(self, host):
+        return self._hosts.setdefault(
+            host, {'limit': float(self._INITIAL_LIMIT), 'active': 0, 'resume_at': 0, 'decreased_at': 0})
+
+    def acquire(self, host, max_limit):
+        """Wait for a free slot; returns the start time to pass to release()"""
+        with self._condition:
+            state = self._state(host)
+            while True:
+                wait = state['resume_at'] - time.monotonic()
+                if wait <= 0 and state['active'] < min(int(state['limit']), max_limit):
+                    state['active'] += 1
+                    return time.monotonic()
+                self._condition.wait(wait if wait > 0 else None)
+
+    def release(self, host, max_limit, started, congested=False, retry_after=None):
+        """Return the new limit of the host"""
+        with self._condition:
+            state = self._state(host)
+            state['active'] -= 1
+            if congested:
+                if started >= state['decreased_at']:
+                    state['limit'] = max(state['limit'] / 2, 1)
+                    state['decreased_at'] = time.monotonic()
+                if retry_after:
+                    state['resume_at'] = max(state['resume_at'], time.monotonic() + retry_after)
+            else:
+                state['limit'] = min(state['limit'] + 1 / state['limit'], max_limit)
+            self._condition.notify_all()
+            return int(state['limit'])
+
+
+_SCHEDULER = _HostScheduler()
+_SCHEDULED = threading.local()  # active: whether the thread holds a _SCHEDULER slot, see HypnotubeBaseIE._scheduled
+
+
+def _caused_by(err, exc_types):
+    """Whether err or any exception it wraps is one of exc_types
+
+    yt-dlp, requests and urllib3 each wrap network errors in their own, in causes, contexts, args or reasons.
+    """
+    pending, seen = [err], set()
+    while pending:
+        exc = pending.pop()
+        if not isinstance(exc, BaseException) or id(exc) in seen:
+            continue
+        if isinstance(exc, exc_types):
+            return True
+        seen.add(id(exc))
+        pending.extend((exc.__cause__, exc.__context__, getattr(exc, 'cause', None), getattr(exc, 'reason', None),
+                        *exc.args))
+    return False
+
+
+# Class of a Hypnotube URL, as shown in the request statistics
+_URL_CLASSES = [(url_class, re.compile(pattern)) for url_class, pattern in (
+    ('comments', r'/template\.ajax_comments\.php'),
+    ('login', r'^/login'),
+    ('profile', r'^/my-profile'),
+    ('watch', r'^/video/'),
+    ('gallery', r'^/galleries/'),
+    ('listing', r'^/(?:channels|uploads-by-user|playlist|favorites)/'),
+    ('media', r'\.(?:mp4|m4v|webm|jpe?g|png|gif)$'),
+)]
+
+
+class _Instrumentation:
+    """Timers and counters of every request and parse phase of this process
+
+    Enabled by --verbose, which prints a summary when the process exits, or by --extractor-args
+    "hypnotube:trace=FILE" (a Chrome trace, see chrome://tracing or https://ui.perfetto.dev) and
+    "hypnotube:profile=FILE" (cProfile statistics of the main thread from the first extraction on).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = False
+        self._started = False
+        self._origin = time.perf_counter()
+        self._requests = collections.defaultdict(lambda: [0, 0, 0.0, 0.0])  # count, bytes, seconds, max seconds
+        self._phases = collections.defaultdict(lambda: [0, 0.0, 0.0])  # count, seconds, max seconds
+        self._events = None  # Chrome trace events, when tracing
+        self._profile = None
+
+    def start(self, ie):
+        """Enable the instrumentation if the options of ie ask for it; only the first extraction decides"""
+        with self.lock:
+            if self._started:
+                return
+            self._started = True
+            verbose = ie.get_param('verbose')
+            trace_file = ie._hypnotube_arg('trace', casesense=True)
+            profile_file = ie._hypnotube_arg('profile', casesense=True)
+            if not (verbose or trace_file or profile_file):
+                return
+            self.enabled = True
+            if trace_file:
+                self._events = []
+            if profile_file:
+                import cProfile
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            atexit.register(self._finish, ie, verbose, trace_file, profile_file)
+
+    @staticmethod
+    def url_class(url):
+        path = urlparse(url).path
+        return next((url_class for url_class, regex in _URL_CLASSES if regex.search(path)), 'other')
+
+    def _event(self, category, name, started, seconds, args):
+        if self._events is not None:
+            self._events.append({
+                'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': round((started - self._origin) * 1e6), 'dur': round(seconds * 1e6), 'args': args,
+            })
+
+    def record_request(self, url, status, started, response=None):
+        """Count a finished request; the bytes of response are added as they are read"""
+        seconds = time.perf_counter() - started
+        url_class = self.url_class(url)
+        args = {'url': url, 'status': status, 'bytes': 0}
+        with self.lock:
+            stats = self._requests[url_class, status]
+            stats[0] += 1
+            stats[2] += seconds
+            stats[3] = max(stats[3], seconds)
+            self._event('request', url_class, started, seconds, args)
+
+        if response is not None:
+            read = response.read
+
+            def counting_read(*read_args, **read_kwargs):
+                data = read(*read_args, **read_kwargs)
+                with self.lock:
+                    stats[1] += len(data)
+                    args['bytes'] += len(data)
+                return data
+            response.read = counting_read
+
+    def record_phase(self, name, started, seconds):
+        with self.lock:
+            stats = self._phases[name]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            self._event('phase', name, started, seconds, {})
+
+    def summary(self):
+        """Lines of a table of the requests per URL class and status, and of the parse phases"""
+        with self.lock:
+            requests, phases = sorted(self._requests.items(), key=str), sorted(self._phases.items())
+        lines = [f'{"request":<24}{"count":>7}{"KiB":>10}{"total ms":>11}{"mean ms":>10}{"max ms":>10}']
+        for (url_class, status), (count, size, seconds, max_seconds) in requests:
+            lines.append(
+                f'{f"{url_class} {status}":<24}{count:>7}{size / 1024:>10.1f}{seconds * 1e3:>11.1f}'
+                f'{seconds / count * 1e3:>10.1f}{max_seconds * 1e3:>10.1f}')
+        lines.append(f'{"phase":<24}{"count":>7}{"":>10}{"total ms":>11}{"mean ms":>10}{"max ms":>10}')
+        for name, (count, seconds, max_seconds) in phases:
+            lines.append(
+                f'{name:<24}{count:>7}{"":>10}{seconds * 1e3:>11.1f}{seconds / count * 1e3:>10.1f}'
+                f'{max_seconds * 1e3:>10.1f}')
+        return lines
+
+    def _finish(self, ie, verbose, trace_file, profile_file):
+        # The statistics cover every Hypnotube extractor, not just ie
+        ydl = ie._downloader
+        if verbose:
+            ydl.write_debug('[hypnotube] Requests and parse phases; phase times include the requests and phases they wait for')
+            for line in self.summary():
+                ydl.write_debug(f'[hypnotube] {line}')
+        if trace_file:
+            with self.lock:
+                trace = {'traceEvents': self._events, 'displayTimeUnit': 'ms'}
+            with open(trace_file, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            ydl.to_screen(f'[hypnotube] Wrote request and parse phase trace to {trace_file}')
+        if profile_file:
+            self._profile.disable()
+            self._profile.dump_stats(profile_file)
+            ydl.to_screen(f'[hypnotube] Wrote profile to {profile_file}; view it with: python -m pstats {profile_file}')
+
+
+_INSTRUMENTATION = _Instrumentation()
+
+
+def _timed_phase(func):
+    """Time every call of an extractor method as a parse phase when instrumentation is enabled
+
+    Generators are timed while they produce items, not while the caller consumes them.
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def timed_generator(*args, **kwargs):
+            if not _INSTRUMENTATION.enabled:
+                return (yield from func(*args, **kwargs))
+            generator = func(*args, **kwargs)
+            started, seconds = time.perf_counter(), 0
+            try:
+                while True:
+                    resumed = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration as e:
+                        return e.value
+                    finally:
+                        seconds += time.perf_counter() - resumed
+                    yield item
+            finally:
+                generator.close()
+                _INSTRUMENTATION.record_phase(func.__name__, started, seconds)
+        return timed_generator
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        if not _INSTRUMENTATION.enabled:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _INSTRUMENTATION.record_phase(func.__name__, started, time.perf_counter() - started)
+    return timed
+
+
+_FORMAT_PROBES = collections.OrderedDict()  # Format URL -> probe result, see HypnotubeVideoIE._probe_format
+_FORMAT_PROBES_SIZE = 1024
+_FORMAT_PROBES_LOCK = threading.Lock()
+_CONTENT_RANGE_RE = re.compile(r'bytes\s+\d+-\d+/(?P<size>\d+)')
+
+
+class _ListingPrefetcher:
+    """Downloads the next few listing pages on a thread pool while the current one is being consumed"""
+
+    def __init__(self, download_page, window):
+        self._download_page = download_page  # page_num -> webpage, or None past the end of the listing
+        self._window = window
+        self._executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix='hypnotube-prefetch') if window else None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._end = None  # First page number known to be past the end of the listing
+
+    def get(self, page_num, last_page=None):
+        """The webpage of page_num; last_page, if known, is the last page the consumer will ask for"""
+        with self._lock:
+            if self._end is not None and page_num >= self._end:
+                return None
+            future = self._futures.pop(page_num, None)
+            # Pages behind the current one are never asked for again by a sequential consumer
+            for stale_num in [num for num in self._futures if num < page_num]:
+                self._futures.pop(stale_num).cancel()
+            if self._executor:
+                last_num = page_num + self._window if last_page is None else min(page_num + self._window, last_page)
+                for next_num in range(page_num + 1, last_num + 1):
+                    if next_num not in self._futures:
+                        self._futures[next_num] = self._executor.submit(self._download_page, next_num)
+
+        webpage = future.result() if future else self._download_page(page_num)
+        if webpage is None:
+            self.stop(page_num)
+        return webpage
+
+    def stop(self, page_num):
+        """Mark page_num as the end of the listing, throwing away everything fetched past it"""
+        with self._lock:
+            if self._end is None or page_num < self._end:
+                self._end = page_num
+            for num in [num for num in self._futures if num >= self._end]:
+                self._futures.pop(num).cancel()
+            if self._executor and not self._futures:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+class _ItemIdSet:
+    """Set of (ie_key, numeric item ID) pairs stored as a bitmap, so six-figure crawls take a few hundred KB"""
+    _KINDS = ('HypnotubeVideo', 'HypnotubeGallery')
+
+    def __init__(self):
+        self._bits = bytearray()
+        self.duplicates = 0  # Number of add() calls for items that were already in the set
+
+    def _position(self, ie_key, item_id):
+        return int(item_id) * len(self._KINDS) + self._KINDS.index(ie_key)
+
+    def __contains__(self, item):
+        byte, bit = divmod(self._position(*item), 8)
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << bit))
+
+    def add(self, ie_key, item_id):
+        """Add an item; returns False if it was already present"""
+        byte, bit = divmod(self._position(ie_key, item_id), 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits) + 4096))
+        if self._bits[byte] & (1 << bit):
+            self.duplicates += 1
+            return False
+        self._bits[byte] |= 1 << bit
+        return True
+
+
+class _IncrementalCrawl:
+    """Ends a listing once enough consecutive items (or whole pages of them) were seen by an earlier run"""
+
+    def __init__(self, is_seen, max_seen_items=None, max_seen_pages=None, on_end=None, report=None):
+        self._is_seen = is_seen  # url_result -> bool
+        self._max_seen_items = max_seen_items
+        self._max_seen_pages = max_seen_pages
+        self._on_end = on_end  # Called once with the entries of the first page when the crawl ends
+        self.report = report
+        self._seen_items = self._seen_pages = 0
+        self._first_page = None
+        self.ended = False
+
+    def cutoff(self, entries, page_num):
+        """Return how many entries of the page to keep, or None if the crawl goes on after this page"""
+        if page_num == 1:
+            self._first_page = entries
+        all_seen = True
+        for idx, entry in enumerate(entries):
+            if entry is None:
+                continue
+            if not self._is_seen(entry):
+                self._seen_items = 0
+                all_seen = False
+                continue
+            self._seen_items += 1
+            if self._max_seen_items and self._seen_items >= self._max_seen_items:
+                return idx + 1
+        self._seen_pages = self._seen_pages + 1 if all_seen else 0
+        if self._max_seen_pages and self._seen_pages >= self._max_seen_pages:
+            return len(entries)
+        return None
+
+    def end(self):
+        if not self.ended:
+            self.ended = True
+            if self._on_end and self._first_page is not None:
+                self._on_end(self._first_page)
+
+
+class _CrawlCheckpoint:
+    """Progress of a listing crawl, saved every few pages so that an interrupted crawl can be resumed
+
+    The entries of every finished page are kept, so that a resumed crawl replays them without any request
+    and playlist indices stay the same; the --download-archive then skips what was already downloaded.
+    """
+
+    def __init__(self, source, load, store, interval, resume=False, report=None):
+        self._source = source
+        self._load, self._store = load, store  # Cache accessors, store() is atomic
+        self._interval = interval
+        self.report = report
+        saved = load() if resume else None
+        self.pages = saved['pages'] if saved and saved.get('source') == source else []
+        self._saved_count = len(self.pages)
+        self._finished = False
+
+    @property
+    def resume_page(self):
+        """The last page of the checkpoint is downloaded again to detect whether the listing has shifted"""
+        return len(self.pages) or None
+
+    def replay(self, page_num):
+        return self.pages[page_num - 1]
+
+    def check_shift(self, page_num, entries):
+        saved_ids = {entry['id'] for entry in self.pages[page_num - 1] if entry}
+        current_ids = {entry['id'] for entry in entries if entry}
+        if saved_ids == current_ids or not self.report:
+            return
+        if saved_ids.isdisjoint(current_ids):
+            self.report(
+                f'The listing has shifted by more than a page since the checkpoint at page {page_num}; '
+                'items may have been missed, crawl again without resume to be sure')
+        else:
+            self.report(
+                f'The listing has shifted since the checkpoint at page {page_num}: '
+                f'{len(current_ids - saved_ids)} items moved onto the page, {len(saved_ids - current_ids)} moved off it')
+
+    def page_done(self, pages):
+        """pages: entries of every page finished so far, in order"""
+        if self._finished or not self._interval or len(pages) - self._saved_count < self._interval:
+            return
+        self.pages = pages
+        self._saved_count = len(pages)
+        self._store({
+            'source': self._source,
+            'page': len(pages),
+            'pages': [[entry and {k: v for k, v in entry.items() if not k.startswith('__')} for entry in page]
+                      for page in pages],
+        })
+
+    def finish(self):
+        if not self._finished:
+            self._finished = True
+            if self._saved_count:
+                self._store(None)
+
+
+class _BoundedCacheSection:
+    """One section of the yt-dlp cache dir, holding at most max_items files
+
+    The least recently used files are evicted first; file modification times serve as the LRU clock.
+    """
+
+    def __init__(self, cache, section, max_items):
+        self._cache = cache
+        self._section = section
+        self._max_items = max_items
+        self._count = None  # Number of cached files, counted on the first store
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        data = self._cache.load(self._section, key)
+        if data is not None:
+            try:
+                os.utime(self._cache._get_cache_fn(self._section, key, 'json'))
+            except OSError:
+                pass
+        return data
+
+    def _store(self, key, data):
+        self._cache.store(self._section, key, data)
+        with self._lock:
+            if self._count is None:
+                self._count = len(self._files())
+            else:
+                self._count += 1
+            if self._count > self._max_items:
+                self._evict()
+
+    def _files(self):
+        directory = os.path.dirname(self._cache._get_cache_fn(self._section, 'item', 'json'))
+        try:
+            return [entry for entry in os.scandir(directory) if entry.name.endswith('.json')]
+        except OSError:
+            return []
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda entry: entry.stat().st_mtime)
+        # Evict a tenth of the cache at once, so that a directory scan is not needed for every new file
+        excess = max(len(files) - self._max_items * 9 // 10, 0)
+        for entry in files[:excess]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        self._count = len(files) - excess
+
+
+class _ItemMetadataCache(_BoundedCacheSection):
+    """Info dicts of videos and galleries, one file per item, each reused for `ttl` seconds
+
+    Every item holds signed video or image URLs, which expire, and the item page that renews them has all
+    the other fields too, so the whole item expires at once.
+    """
+
+    def __init__(self, cache, section, ttl, max_items=5000, read=True):
+        super().__init__(cache, section, max_items)
+        self._ttl = ttl
+        self._read = read
+
+    def load(self, ie_key, item_id):
+        if not self._read:
+            return None
+        cached = self._load(f'{ie_key}_{item_id}')
+        if not cached or time.time() >= cached['time'] + self._ttl:
+            return None
+        return cached['info']
+
+    def store(self, ie_key, item_id, info):
+        # Comments are downloaded on demand, and keys starting with "__" are never serializable
+        info = {key: value for key, value in info.items()
+                if not key.startswith('__') and key not in ('comments', 'comment_count')}
+        self._store(f'{ie_key}_{item_id}', {'time': time.time(), 'info': info})
+
+
+class _CachedWebpage(str):
+    """Body of a response that went through the _ResponseCache
+
+    `entries` holds the entries parsed from the same content by an earlier run, if there are any.
+    """
+
+    def __new__(cls, body, url, record, entries=None):
+        webpage = super().__new__(cls, body)
+        webpage.url, webpage.record, webpage.entries = url, record, entries
+        return webpage
+
+
+class _ResponseCache(_BoundedCacheSection):
+    """Listing and comments responses with their validators, so that they can be requested conditionally
+
+    Pages that are served without ETag or Last-Modified are still downloaded in full, but their content hash
+    tells whether the entries parsed from them last time can be used again.
+    """
+    _stats = collections.Counter()  # Shared by every extractor of the process
+    _stats_lock = threading.Lock()
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def load(self, url):
+        record = self._load(self._key(url))
+        return record if record and record.get('url') == url else None
+
+    def request_headers(self, record):
+        return filter_dict({
+            'If-None-Match': record.get('etag'),
+            'If-Modified-Since': record.get('last_modified'),
+        }) if record else {}
+
+    def update(self, url, record, body, headers):
+        """Return the webpage for a response and the outcome: "not modified", "unchanged" or "miss"
+
+        A body of None stands for a 304 Not Modified response.
+        """
+        if body is None:
+            outcome, body = 'not modified', record['body']
+            self._count_outcome(outcome, len(body.encode()))
+            return _CachedWebpage(body, url, record, record.get('entries')), outcome
+
+        digest = hashlib.sha1(body.encode()).hexdigest()
+        validators = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        if record and record['digest'] == digest:
+            outcome, entries = 'unchanged', record.get('entries')
+        else:
+            outcome, entries = 'miss', None
+        new_record = {'url': url, 'digest': digest, 'body': body, **validators, 'entries': entries}
+        if new_record != record:
+            self._store(self._key(url), new_record)
+        self._count_outcome(outcome, 0)
+        return _CachedWebpage(body, url, new_record, entries), outcome
+
+    def store_entries(self, webpage, entries):
+        self._store(self._key(webpage.url), {
+            **webpage.record,
+            'entries': [entry and {k: v for k, v in entry.items() if not k.startswith('__')} for entry in entries],
+        })
+
+    def _count_outcome(self, outcome, bytes_saved):
+        with self._stats_lock:
+            self._stats[outcome] += 1
+            self._stats['bytes saved'] += bytes_saved
+
+    @classmethod
+    def summary(cls):
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        return (f'{stats.get("not modified", 0)} not modified, {stats.get("unchanged", 0)} unchanged, '
+                f'{stats.get("miss", 0)} misses, {format_bytes(stats.get("bytes saved", 0))} saved')
+
+
+class _HypnotubePagedList(OnDemandPagedList):
+    """OnDemandPagedList over a Hypnotube listing, whose pages may hold any number of entries
+
+    The number of entries differs from page to page (item kinds filtered out, links grouped into tiles),
+    so entries are counted page by page instead of being located with a fixed page size, and only an
+    empty page ends the listing. download_page returns None for the pages past the end and raises on
+    errors, which fail the listing.
+
+    Items are de-duplicated across pages and across every list sharing the same `seen` set. A duplicate,
+    from an earlier page or from the same one, is replaced by None, which yt-dlp skips, so that playlist
+    indices keep matching the page layout and de-duplication never makes a page look like the last one.
+    """
+
+    def __init__(self, download_page, parse_page, prefetch=0, seen=None, incremental=None, checkpoint=None,
+                 report=None, stop_index=None):
+        self._download_page = download_page  # page_num -> webpage, or None past the end of the listing
+        self._prefetcher = _ListingPrefetcher(self._download_page, prefetch)
+        self._parse_page = parse_page  # (webpage, page_num) -> list of url_results with id and ie_key
+        self._seen = _ItemIdSet() if seen is None else seen
+        self._incremental = incremental
+        self._checkpoint = checkpoint
+        self._report = report
+        self._stop_index = stop_index  # Index after the last entry that will be asked for, if known
+        self._last_page = None  # Last page the current slice may need, see _ListingPrefetcher.get
+        self._longest_page = 0  # Number of entries of the longest page so far
+        self._page_starts = [0]  # Index of the first entry of every page counted so far, and of the next one
+        super().__init__(self._fetch_page, None)
+
+    def _fetch_page(self, pagenum):
+        page_num = pagenum + 1
+        resume_page = self._checkpoint and self._checkpoint.resume_page
+        if resume_page and page_num < resume_page:
+            return self._replay_page(page_num)
+
+        webpage = self._prefetcher.get(page_num, self._last_page)
+        entries = self._parse_page(webpage, page_num) if webpage is not None else []
+        if not entries:
+            self._prefetcher.stop(page_num)
+            self._end_of_listing()
+            return []
+
+        entries = self._deduplicate(entries, page_num)
+        self._longest_page = max(self._longest_page, len(entries))
+        if page_num == resume_page:
+            self._checkpoint.check_shift(page_num, entries)
+        keep = self._incremental and self._incremental.cutoff(entries, page_num)
+        if keep is not None:
+            if self._incremental.report:
+                self._incremental.report(f'Incremental crawl: page {page_num} reached items seen by an earlier run, stopping')
+            self._prefetcher.stop(page_num + 1)
+            self._end_of_listing()
+            return entries[:keep]
+        if self._checkpoint:
+            self._checkpoint.page_done(self._finished_pages(pagenum, entries))
+        return entries
+
+    def _replay_page(self, page_num):
+        entries = self._checkpoint.replay(page_num)
+        for entry in entries:
+            if entry:
+                self._seen.add(entry['ie_key'], entry['id'])
+        if page_num == 1 and self._checkpoint.report:
+            self._checkpoint.report(f'Resuming from the checkpoint at page {self._checkpoint.resume_page}')
+        return entries
+
+    def _finished_pages(self, pagenum, entries):
+        """Entries of the contiguous run of pages from the first one up to the page being fetched"""
+        pages = []
+        for num in range(pagenum):
+            if num not in self._cache:
+                return []
+            pages.append(self._cache[num])
+        return pages + [entries]
+
+    def _end_of_listing(self):
+        if self._incremental:
+            self._incremental.end()
+        if self._checkpoint:
+            self._checkpoint.finish()
+
+    def _deduplicate(self, entries, page_num):
+        page_keys, unique_entries = set(), []
+        duplicates_before = self._seen.duplicates
+        for entry in entries:
+            key = (entry['ie_key'], entry['id'])
+            if key in page_keys:
+                self._seen.duplicates += 1
+                unique_entries.append(None)
+                continue
+            page_keys.add(key)
+            unique_entries.append(entry if self._seen.add(*key) else None)
+
+        duplicates = self._seen.duplicates - duplicates_before
+        if duplicates and self._report:
+            self._report(f'Skipped {duplicates} duplicate items on page {page_num} ({self._seen.duplicates} in total)')
+        return unique_entries
+
+    def _count_page(self, pagenum, entries):
+        if pagenum == len(self._page_starts) - 1:
+            self._page_starts.append(self._page_starts[-1] + len(entries))
+
+    def _getslice(self, start, end):
+        # yt-dlp asks for one entry at a time, so only a longer slice tells how far the consumer goes
+        stop = end if end is not None and end - start > 1 else self._stop_index
+        # Pages before the one holding start are skipped, going by the page starts counted so far
+        first_pagenum = max(bisect.bisect_right(self._page_starts, start) - 1, 0)
+        first_index = self._page_starts[first_pagenum]  # Index of the first entry of the page
+        for pagenum in itertools.count(first_pagenum):
+            if end is not None and first_index >= end:
+                return
+            self._last_page = self._estimate_last_page(pagenum, first_index, stop)
+            try:
+                entries = self.getpage(pagenum)
+            except Exception:
+                self._pagecount = pagenum - 1
+                raise
+            if not entries:
+                return
+            self._count_page(pagenum, entries)
+            if first_index + len(entries) > start:
+                yield from entries[max(start - first_index, 0):None if end is None else end - first_index]
+            first_index += len(entries)
+
+    def _estimate_last_page(self, pagenum, first_index, stop):
+        """Number of the last page holding entries before index stop, going by the longest page so far"""
+        if stop is None:
+            return None
+        if not self._longest_page:
+            return pagenum + 1  # Nothing to go by before the first page is in
+        return pagenum + max(math.ceil((stop - first_index) / self._longest_page), 1)
+
+    def fetch_page(self, page_num):
+        """Entries of a single page; None or no entries past the end of the listing
+
+        For crawlers that spread the pages of a listing over several processes, so there is no prefetching,
+        no de-duplication against other pages and no incremental or checkpoint handling. A page that fails
+        to download raises, instead of ending the listing, so that the crawler can retry it.
+        """
+        webpage = self._download_page(page_num)
+        return self._parse_page(webpage, page_num) if webpage is not None else None
+
+    def __iter__(self):
+        """Entries page by page without keeping them, for consumers that go through a listing only once
+
+        yt-dlp indexes the list instead, which keeps every page; so do crawl checkpoints, which are
+        therefore not saved while iterating.
+        """
+        first_index = 0
+        for pagenum in itertools.count():
+            entries = self._cache.get(pagenum)
+            if entries is None:
+                self._last_page = self._estimate_last_page(pagenum, first_index, self._stop_index)
+                entries = self._fetch_page(pagenum)
+            if not entries:
+                return
+            self._count_page(pagenum, entries)
+            yield from entries
+            first_index += len(entries)
+
+
+class HypnotubeBaseIE(InfoExtractor):
+    _LOGIN_URL = 'https://hypnotube.com/login'
+    _PROFILE_URL = 'https://hypnotube.com/my-profile'
+    _NETRC_MACHINE = 'hypnotube'
+    _CACHE_SECTION = 'hypnotube'
+    _SESSION_TTL = 7 * 24 * 60 * 60  # Seconds a stored session is trusted for, see extractor-arg session_ttl
+    _PREFETCH_PAGES = 2  # Listing pages downloaded ahead of the current one, see extractor-arg prefetch
+    _CHECKPOINT_INTERVAL = 10  # Listing pages between crawl checkpoints, see extractor-arg checkpoint_interval
+    _METADATA_CACHE_SIZE = 5000  # Items kept in the metadata cache, see extractor-arg metadata_cache_size
+    _METADATA_TTL = 60 * 60  # Seconds an item is reused from the metadata cache, see extractor-arg metadata_ttl
+    _RESPONSE_CACHE_SIZE = 2000  # Responses kept in the response cache, see extractor-arg response_cache_size
+    _MAX_CONCURRENCY = 8  # Upper bound of concurrent requests per host, see extractor-arg max_concurrency
+    _THROTTLING_STATUSES = (429, 503)
+    _CACHED_ITEM_ARGS = ()  # true/false extractor-args that change what is extracted, see _cached_item_key
+
+    def extract(self, url):
+        _INSTRUMENTATION.start(self)
+        return super().extract(url)
+
+    def _hypnotube_arg(self, key, default=None, casesense=False):
+        """Return the first value of --extractor-args "hypnotube:KEY=VALUE", shared by all Hypnotube extractors"""
+        values = self._configuration_arg(key, [], ie_key='hypnotube', casesense=casesense)
+        return values[0] if values else default
+
+    def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fatal=True, data=None, **kwargs):
+        """Every Hypnotube request goes through _SCHEDULER, see _scheduled"""
+        def request():
+            url = self._request_url(url_or_request)
+            request_started = time.perf_counter()
+            try:
+                urlh = super(HypnotubeBaseIE, self)._request_webpage(
+                    url_or_request, video_id, note, None if errnote is False else errnote, True, data, **kwargs)
+            except ExtractorError as e:
+                if _INSTRUMENTATION.enabled:
+                    _INSTRUMENTATION.record_request(
+                        url, e.cause.status if isinstance(e.cause, HTTPError) else 'error', request_started)
+                raise
+            if _INSTRUMENTATION.enabled:
+                _INSTRUMENTATION.record_request(url, urlh.status, request_started, urlh)
+            return urlh
+
+        if getattr(_SCHEDULED, 'active', False):
+            return request()  # The slot of _download_webpage_handle covers it
+        return self._scheduled(request, url_or_request, video_id, errnote, fatal, data)
+
+    def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=None, fatal=True,
+                                 encoding=None, data=None, **kwargs):
+        """Holds the _SCHEDULER slot of the request until the body has been read"""
+        return self._scheduled(
+            functools.partial(
+                super()._download_webpage_handle, url_or_request, video_id, note,
+                None if errnote is False else errnote, True, encoding, data, **kwargs),
+            url_or_request, video_id, errnote, fatal, data)
+
+    @staticmethod
+    def _request_url(url_or_request):
+        if isinstance(url_or_request, Request):
+            return url_or_request.url
+        if isinstance(url_or_request, urllib.request.Request):
+            # Legacy requests, such as yt_dlp.utils.HEADRequest, which InfoExtractor still converts
+            return url_or_request.get_full_url()
+        return url_or_request
+
+    def _scheduled(self, func, url_or_request, video_id, errnote, fatal, data):
+        """Call func() while holding a _SCHEDULER slot for its host; throttled GET requests are retried with jitter
+
+        func raises on errors, which are returned or reported as InfoExtractor does for errnote and fatal.
+        Errors reading the body are raised by InfoExtractor as they are, so they are here too. The number of
+        retries is --extractor-retries. The limit of concurrent requests per host never exceeds
+        --extractor-args "hypnotube:max_concurrency=N".
+        """
+        host = urlparse(self._request_url(url_or_request)).netloc
+        max_limit = max(int_or_none(self._hypnotube_arg('max_concurrency')) or self._MAX_CONCURRENCY, 1)
+        retries = self.get_param('extractor_retries', 3)
+        is_post = data is not None or getattr(url_or_request, 'data', None) is not None
+
+        for attempt in itertools.count(1):
+            started = _SCHEDULER.acquire(host, max_limit)
+            congested = retry_after = None
+            _SCHEDULED.active = True
+            try:
+                return func()
+            except ExtractorError as e:
+                congested, retry_after = self._is_throttled(e.cause)
+                if not congested or is_post or attempt > retries:
+                    if errnote is False:
+                        return False
+                    if fatal:
+                        raise
+                    self.report_warning(e.orig_msg, video_id=video_id)
+                    return False
+            except TransportError as e:
+                congested, retry_after = self._is_throttled(e)
+                if not congested or is_post or attempt > retries:
+                    raise
+            finally:
+                _SCHEDULED.active = False
+                limit = _SCHEDULER.release(host, max_limit, started, congested, retry_after)
+
+            # Full jitter keeps the retries of parallel requests apart; Retry-After is waited for by the scheduler
+            delay = random.uniform(0, min(2 ** attempt, 60))
+            self.to_screen(
+                f'{host} is throttling requests, allowing {limit} at a time; retrying in '
+                f'{max(delay, retry_after or 0):.1f}s ({attempt}/{retries})')
+            time.sleep(delay)
+
+    def _is_throttled(self, err):
+        """Return (whether err means the host is overloaded, seconds the host asked to wait)"""
+        if isinstance(err, HTTPError):
+            if err.status not in self._THROTTLING_STATUSES:
+                return False, None
+            retry_after = err.response.headers.get('Retry-After')
+            seconds = int_or_none(retry_after)
+            if seconds is None and retry_after:
+                timestamp = unified_timestamp(retry_after)
+                seconds = timestamp - time.time() if timestamp else None
+            return True, min(max(seconds or 0, 0), 600) or None
+        # Other network errors, such as DNS, certificate or refused connections, say nothing about load
+        return isinstance(err, TransportError) and _caused_by(err, (TimeoutError, ConnectionResetError)), None
+
+    def _submit(self, func, *args, **kwargs):
+        """Start func on the shared request pool; errors are raised from Future.result() as if called directly"""
+        global _REQUEST_POOL
+        with _REQUEST_POOL_LOCK:
+            if _REQUEST_POOL is None:
+                _REQUEST_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='hypnotube-request')
+        return _REQUEST_POOL.submit(func, *args, **kwargs)
+
+    @functools.cached_property
+    def _metadata_cache(self):
+        """Cache of extracted videos and galleries, controlled by --extractor-args "hypnotube:metadata_cache=on|refresh|off"
+
+        "refresh" extracts every item again and stores the result. Items expire after
+        "hypnotube:metadata_ttl" seconds.
+        """
+        mode = self._hypnotube_arg('metadata_cache', 'on')
+        if mode == 'off' or not self.cache.enabled:
+            return None
+        ttl = self._hypnotube_arg('metadata_ttl')
+        if ttl is not None and int_or_none(ttl) is None:
+            raise ExtractorError(f'Invalid metadata_ttl: {ttl}, expected a number of seconds', expected=True)
+        max_items = int_or_none(self._hypnotube_arg('metadata_cache_size'))
+        return _ItemMetadataCache(
+            self.cache, f'{self._CACHE_SECTION}-items', self._METADATA_TTL if ttl is None else int(ttl),
+            self._METADATA_CACHE_SIZE if max_items is None else max_items, read=mode != 'refresh')
+
+    def _cached_item_key(self, item_id):
+        """Items extracted with any of _CACHED_ITEM_ARGS set are cached apart from the plain ones"""
+        return '-'.join([item_id, *(arg for arg in self._CACHED_ITEM_ARGS if self._hypnotube_arg(arg, 'false') == 'true')])
+
+    def _load_cached_item(self, item_id):
+        info = self._metadata_cache and self._metadata_cache.load(self.ie_key(), self._cached_item_key(item_id))
+        if info:
+            self.write_debug(f'{item_id}: Using cached metadata')
+        return info
+
+    def _store_cached_item(self, item_id, info):
+        if self._metadata_cache:
+            self._metadata_cache.store(self.ie_key(), self._cached_item_key(item_id), info)
+        return info
+
+    @functools.cached_property
+    def _response_cache(self):
+        """Cache of listing and comments responses; --extractor-args "hypnotube:response_cache=off" turns it off"""
+        if self._hypnotube_arg('response_cache', 'on') == 'off' or not self.cache.enabled:
+            return None
+        max_items = int_or_none(self._hypnotube_arg('response_cache_size'))
+        return _ResponseCache(
+            self.cache, f'{self._CACHE_SECTION}-responses',
+            self._RESPONSE_CACHE_SIZE if max_items is None else max_items)
+
+    def _download_cached_webpage_handle(self, url, item_id, note, fatal=True):
+        """_download_webpage_handle that asks the server whether the response cached for url has changed
+
+        Returns a _CachedWebpage, unless the response was redirected; redirects are never cached.
+        """
+        if not self._response_cache:
+            return self._download_webpage_handle(url, item_id, note=note, fatal=fatal)
+
+        record = self._response_cache.load(url)
+        headers = self._response_cache.request_headers(record)
+        res = self._download_webpage_handle(
+            url, item_id, note=note, fatal=fatal, headers=headers, expected_status=304 if headers else None)
+        if not res or res[1].url != url:
+            return res
+        body, urlh = res
+        webpage, outcome = self._response_cache.update(url, record, None if urlh.status == 304 else body, urlh.headers)
+        self.write_debug(f'{url}: Response cache {outcome} ({self._response_cache.summary()} in total)')
+        return webpage, urlh
+
+    def _paged_listing(self, download_page, parse_page, source, seen=None):
+        """Lazily paged playlist entries; download_page(page_num) may run on a prefetch thread
+
+        `source` is a stable key for the listing, such as "channel_38"; without one, the listing has no
+        crawl checkpoints and no incremental crawl. Pass the same `seen` _ItemIdSet to every listing of one
+        crawl to de-duplicate items across them.
+        """
+        def parse_cached_page(webpage, page_num):
+            # Entries parsed from identical content by an earlier run are used as they are
+            if getattr(webpage, 'entries', None):
+                return webpage.entries
+            entries = parse_page(webpage, page_num)
+            if entries and isinstance(webpage, _CachedWebpage):
+                self._response_cache.store_entries(webpage, entries)
+            return entries
+
+        prefetch = int_or_none(self._hypnotube_arg('prefetch'))
+        return _HypnotubePagedList(
+            download_page, parse_cached_page, self._PREFETCH_PAGES if prefetch is None else max(prefetch, 0),
+            seen=seen, incremental=self._incremental_crawl(source) if source else None,
+            checkpoint=self._crawl_checkpoint(source) if source else None,
+            report=self.write_debug, stop_index=self._requested_stop_index())
+
+    def _requested_stop_index(self):
+        """Index after the last playlist entry that --playlist-items or --playlist-end asks for, None for all
+
+        Pages past it are not prefetched. For a listing that is chained after another one, such as the
+        videos after the photos of a user, this is an upper bound.
+        """
+        playlist_items = self.get_param('playlist_items')
+        if not playlist_items:
+            playlist_end = self.get_param('playlistend')
+            return None if playlist_end in (None, -1) else playlist_end
+        stops = []
+        try:
+            for item in PlaylistEntries.parse_playlist_items(playlist_items):
+                if isinstance(item, int):
+                    stops.append(item if item > 0 else None)
+                elif (item.step or 1) < 0:
+                    stops.append(item.start if item.start and item.start > 0 else None)
+                else:
+                    stops.append(int(item.stop) if item.stop is not None and 0 <= item.stop < math.inf else None)
+        except ValueError:
+            return None
+        return None if None in stops else max(stops, default=None)
+
+    def _crawl_checkpoint(self, source):
+        """Checkpoints are saved every "hypnotube:checkpoint_interval" pages (0 disables them) and used by
+        --extractor-args "hypnotube:resume=true" to continue an interrupted crawl of the same listing"""
+        interval = int_or_none(self._hypnotube_arg('checkpoint_interval'))
+        interval = self._CHECKPOINT_INTERVAL if interval is None else interval
+        resume = self._hypnotube_arg('resume', 'false') not in ('false', '0', 'no')
+        if not interval and not resume:
+            return None
+        cache_key = f'checkpoint_{source}'
+        return _CrawlCheckpoint(
+            source, functools.partial(self.cache.load, self._CACHE_SECTION, cache_key),
+            functools.partial(self.cache.store, self._CACHE_SECTION, cache_key),
+            interval, resume=resume, report=self.to_screen)
+
+    def _incremental_crawl(self, source):
+        """Incremental mode: --extractor-args "hypnotube:incremental=ITEMS;incremental_pages=PAGES" stops a
+        listing after that many consecutive items, or whole pages, that are in the --download-archive or
+        were on the first page of the previous crawl of the same source"""
+        max_seen_items = int_or_none(self._hypnotube_arg('incremental'))
+        max_seen_pages = int_or_none(self._hypnotube_arg('incremental_pages'))
+        if not max_seen_items and not max_seen_pages:
+            return None
+
+        cache_key = f'incremental_{source}'
+        last_seen_ids = set(self.cache.load(self._CACHE_SECTION, cache_key) or [])
+
+        def is_seen(entry):
+            return entry['id'] in last_seen_ids or self._downloader.in_download_archive(entry)
+
+        def remember_first_page(entries):
+            self.cache.store(self._CACHE_SECTION, cache_key, [entry['id'] for entry in entries if entry])
+
+        return _IncrementalCrawl(
+            is_seen, max_seen_items, max_seen_pages, on_end=remember_first_page, report=self.to_screen)
+
+    @_timed_phase
+    def _scan_listing_tiles(self, webpage, kinds=('video', 'galleries')):
+        """Yield one url_result per listing tile in document order, without building a DOM, with the title,
+        duration, view count and thumbnail the tile shows, so --flat-playlist gets them without visiting each item"""
+        ie_keys = {'video': HypnotubeVideoIE.ie_key(), 'galleries': HypnotubeGalleryIE.ie_key()}
+        tiles = []  # [key, links] for consecutive links to the same item
+        for mobj in _LISTING_LINK_RE.finditer(webpage):
+            key = (mobj.group('kind'), mobj.group('id'))
+            if tiles and tiles[-1][0] == key:
+                tiles[-1][1].append(mobj)
+            else:
+                tiles.append([key, [mobj]])
+
+        for idx, ((kind, item_id), links) in enumerate(tiles):
+            if kind not in kinds:
+                continue
+            tile_end = tiles[idx + 1][1][0].start() if idx + 1 < len(tiles) else len(webpage)
+            tile = webpage[links[0].start():min(tile_end, links[0].start() + _TILE_MAX_LENGTH)]
+            yield self.url_result(
+                unescapeHTML(links[0].group('url')), ie_keys[kind], item_id,
+                **self._extract_tile_info(tile, links, webpage))
+
+    def _extract_tile_info(self, tile, links, webpage):
+        # extract_attributes would be several times slower than these plain regexes on a 30-tile page
+        title = None
+        for mobj in links:
+            attrs = {m.group('name'): m.group('value') for m in _TILE_ATTR_RE.finditer(mobj.group(0))}
+            title = attrs.get('title') or clean_html(webpage[mobj.end():webpage.find('</a>', mobj.end())])
+            if title:
+                break
+
+        img_tag = self._search_regex(_TILE_IMG_RE, tile, 'thumbnail', default='', group=0)
+        img = {m.group('name'): unescapeHTML(m.group('value')) for m in _TILE_ATTR_RE.finditer(img_tag)}
+        return filter_dict({
+            'title': unescapeHTML(title or img.get('alt')) or None,
+            'thumbnail': url_or_none(img.get('data-src') or img.get('src')),
+            'duration': parse_duration(self._search_regex(_TILE_DURATION_RE, tile, 'duration', default=None)),
+            'view_count': str_to_int(self._search_regex(_TILE_VIEWS_RE, tile, 'view count', default=None)),
+        })
+
+    def _download_listing_page(self, page_url, item_id, page_num, note):
+        """Download one listing page; returns None when a page after the first one redirects or is missing
+
+        Server and network errors are retried with jitter, --extractor-retries times; errors that remain
+        are raised, so that a listing never looks shorter than it is.
+        """
+        retries = self.get_param('extractor_retries', 3)
+        for attempt in itertools.count(1):
+            try:
+                webpage, urlh = self._download_cached_webpage_handle(page_url, item_id, note=note)
+                break
+            except ExtractorError as e:
+                if page_num > 1 and isinstance(e.cause, HTTPError) and e.cause.status in (404, 410):
+                    self.write_debug(f'{page_url} is missing (HTTP {e.cause.status}), assuming end of listing')
+                    return None
+                # Throttling has already been retried by _request_webpage
+                transient = (e.cause.status >= 500 if isinstance(e.cause, HTTPError)
+                             else isinstance(e.cause, TransportError))
+                if not transient or self._is_throttled(e.cause)[0] or attempt > retries:
+                    raise
+                error = e
+            delay = random.uniform(0, min(2 ** attempt, 60))
+            self.report_warning(f'{error.orig_msg}; retrying in {delay:.1f}s ({attempt}/{retries})', item_id)
+            time.sleep(delay)
+
+        if page_num > 1 and urlh.url != page_url:
+            self.write_debug(f'{page_url} redirected to {urlh.url}, assuming end of listing')
+            return None
+        return webpage
+
+    @property
+    def _session(self):
+        """Login state of the cookie jar of the YoutubeDL running this extractor"""
+        with _SESSIONS_LOCK:
+            return _SESSIONS.setdefault(self.cookiejar, _HypnotubeSession())
+
+    @_timed_phase
+    def _perform_login(self, username, password):
+        # yt-dlp calls this once for every extractor instance, so only the first call per cookie jar may log in
+        session = self._session
+        with session.lock:
+            if session.account == username:
+                return
+            if self._restore_session(username):
+                return
+            self._login(username, password)
+            session.account = username
+            self._store_session(username)
+
+    def _restore_session(self, username):
+        session = self.cache.load(self._CACHE_SECTION, 'session')
+        if not session or session.get('account') != username or session.get('expires', 0) <= time.time():
+            return False
+
+        for cookie in session.get('cookies') or []:
+            self._set_cookie(
+                cookie['domain'], cookie['name'], cookie['value'], expire_time=cookie.get('expires'),
+                path=cookie.get('path', '/'), secure=cookie.get('secure', False))
+
+        # One profile request tells if the stored cookies are still accepted; no login POST is needed for that
+        self._session.username = session.get('username')
+        logged_in_username = self._fetch_profile_username()
+        if not logged_in_username:
+            self.write_debug('Stored Hypnotube session has expired, logging in again')
+            return False
+
+        self._session.account = username
+        self.to_screen(f"Logged in as: {logged_in_username} (stored session)")
+        return True
+
+    def _store_session(self, username):
+        ttl = int_or_none(self._hypnotube_arg('session_ttl')) or self._SESSION_TTL
+        expires = time.time() + ttl
+        cookies = []
+        for cookie in self.cookiejar:
+            if not cookie.domain.lstrip('.').endswith('hypnotube.com'):
+                continue
+            if cookie.expires:
+                expires = min(expires, cookie.expires)
+            cookies.append({
+                'domain': cookie.domain,
+                'name': cookie.name,
+                'value': cookie.value,
+                'path': cookie.path,
+                'expires': cookie.expires,
+                'secure': cookie.secure,
+            })
+
+        self.cache.store(self._CACHE_SECTION, 'session', {
+            'account': username,
+            'username': self._session.username,
+            'expires': expires,
+            'cookies': cookies,
+        })
+
+    def _fetch_profile_username(self):
+        profile_page, urlh = self._download_webpage_handle(
+            self._PROFILE_URL, None, note='Checking login session', fatal=False) or (None, None)
+        # Logged out visitors are redirected from the profile to the login form
+        if not profile_page or urlparse(urlh.url).path.rstrip('/') != '/my-profile':
+            return None
+
+        soup = BeautifulSoup(profile_page, _html_parser())
+        username_elem = soup.find('li', class_='profile-field-username')
+        username_value = username_elem.find('span', class_='sub-desc') if username_elem else None
+        if username_value:
+            self._session.username = username_value.get_text(strip=True)
+        return self._session.username
+
+    def _get_logged_in_username(self):
+        """Username of the logged in user; the profile page is downloaded at most once per cookie jar"""
+        session = self._session
+        with session.lock:
+            if not session.username:
+                self._fetch_profile_username()
+            return session.username
+
+    def _login(self, username, password):
+        login_form = {
+            'ahd_username': username,
+            'ahd_password': password,
+            'Submit': ''
+        }
+
+        login_response = self._download_webpage(
+            self._LOGIN_URL, None,
+            note='Logging in',
+            data=urlencode_postdata(login_form))
+
+        if _LOGIN_ERROR_RE.search(login_response):
+            raise ExtractorError('Login failed: incorrect username or password', expected=True)
+
+        self._detect_logged_in_user(login_response)
+
+    def _detect_logged_in_user(self, webpage):
+        soup = BeautifulSoup(webpage, _html_parser())
+        user_name_elem = soup.find('span', class_='name_normal user-name') or soup.find('span', 'name_premium user-name')
+
+        if user_name_elem:
+            logged_in_user = user_name_elem.get_text(strip=True)
+            self._session.username = logged_in_user
+            self.to_screen(f"Logged in as: {logged_in_user}")
+        else:
+            raise ExtractorError('Login failed', expected=False)
+
+    @_timed_phase
+    def _parse_item_page(self, webpage):
+        """Find every element the field helpers need in a single pass over a video or gallery page"""
+        soup = BeautifulSoup(webpage, _html_parser(), parse_only=_ItemPageStrainer())
+        page = {'gallery_items': []}
+        for elem in soup.find_all(True):
+            name, elem_id, classes = elem.name, elem.get('id'), elem.get('class') or []
+            if name == 'h1':
+                page.setdefault('title', elem)
+            elif name == 'meta' and elem.get('property') == 'og:image':
+                page.setdefault('thumbnail', elem)
+            elif name == 'a' and _UPLOADER_URL_RE.search(elem.get('href') or ''):
+                page.setdefault('uploader', elem)
+            elif name == 'video' and elem_id in ('plyr_player', 'thisPlayer'):
+                page.setdefault(elem_id, elem)
+            elif elem_id in ('notice_overl', 'playerOverlay'):
+                page.setdefault(elem_id, elem)
+            elif name == 'div' and 'main-description' in classes:
+                page.setdefault('description', elem)
+            elif name == 'div' and 'stats-container' in classes:
+                page.setdefault('stats', elem)
+            elif 'gallery-item-col' in classes:
+                page['gallery_items'].append(elem)
+        return page
+
+    @_timed_phase
+    def _extract_uploader_info(self, page):
+        uploader_elem = page.get('uploader')
+        uploader_id, uploader_url, uploader_name = None, None, "Anonymous"
+
+        if uploader_elem:
+            uploader_id_match = _UPLOADER_URL_RE.search(uploader_elem['href'])
+            uploader_id = uploader_id_match.group('id') if uploader_id_match else None
+            uploader_url = uploader_elem['href']
+            uploader_name = uploader_elem.get_text(strip=True).replace("Submitted by", "").strip()
+
+        return uploader_id, uploader_name, uploader_url
+
+    def _download_comments_page(self, item_id):
+        comments_url = f'https://hypnotube.com/templates/hypnotube/template.ajax_comments.php?id={item_id}'
+        webpage, _ = self._download_cached_webpage_handle(comments_url, item_id, note='Downloading comments page')
+        return webpage
+
+    def _prefetch_comments_page(self, item_id):
+        """Start downloading the comments page alongside the item page, if comments were requested"""
+        if not self.get_param('getcomments'):
+            return None
+        return self._submit(self._download_comments_page, item_id)
+
+    @_timed_phase
+    def _get_comments(self, item_id, comments_page=None):
+        # Only called by yt-dlp when comments were requested (--write-comments / getcomments)
+        max_comments = int_or_none(self._hypnotube_arg('max_comments'))
+        if comments_page is not None:
+            comments_webpage = comments_page.result()
+        else:
+            comments_webpage = self._download_comments_page(item_id)
+        soup = BeautifulSoup(comments_webpage, _html_parser())
+
+        for comment_block in itertools.islice(soup.find_all('div', class_='block'), max_comments):
+            # Extract author name
+            author = comment_block.find('strong').get_text(strip=True)
+
+            # Extract author link and associated details
+            author_link = comment_block.find_previous_sibling('a')
+            author_thumbnail = author_link.find('img')['src'] if author_link and author_link.find('img') else None
+            author_url = author_link['href'] if author_link and 'href' in author_link.attrs else None
+            author_id_match = _COMMENT_AUTHOR_URL_RE.search(author_url) if author_url else None
+            author_id = author_id_match.group(2) if author_id_match else None
+
+            # Correctly determine if the user is VIP or normal based on the class of the <a> tag
+            author_a_tag = comment_block.find('a', href=True)
+            author_membership = ''  # default to NOTHING
+            if author_a_tag:
+                if 'name_premium' in author_a_tag.get('class', []):
+                    author_membership = 'VIP'
+                elif 'name_normal' in author_a_tag.get('class', []):
+                    author_membership = 'normal'
+
+            # Extract comment time text
+            time_element = comment_block.find('a')
+            _time_text = None
+            if time_element:
+                time_text_block = time_element.find_next_sibling(string=True)
+                _time_text = time_text_block.strip() if time_text_block else None
+
+            # Extract comment text
+            text = comment_block.find('p').get_text(strip=True)
+
+            yield {
+                'author': author,
+                'author_id': author_id,
+                'author_thumbnail': author_thumbnail,
+                'author_url': author_url,
+                'author_membership': author_membership,
+                '_time_text': _time_text,
+                'text': text,
+            }
+
+    @_timed_phase
+    def _extract_video_stats(self, page):
+        stats = page['stats'].find_all("li") if page.get('stats') else []
+
+        # Extract duration safely
+        duration_str = stats[0].find("span", class_="sub-label").get_text(strip=True) if len(stats) > 0 else None
+        duration = None
+        if duration_str:
+            duration_parts = duration_str.split(':')
+            if len(duration_parts) == 3:  # HH:MM:SS format
+                duration = int(duration_parts[0]) * 3600 + int(duration_parts[1]) * 60 + int(duration_parts[2])
+            elif len(duration_parts) == 2:  # MM:SS format
+                duration = int(duration_parts[0]) * 60 + int(duration_parts[1])
+        
+        # Extract view count safely
+        view_count = int(stats[1].find("span", class_="sub-label").get_text(strip=True)) if len(stats) > 1 else None
+        
+        # Extract upload date safely
+        upload_date = stats[2].find("span", class_="sub-label").get_text(strip=True).replace("-", "").replace(":", "").replace(" ", "")[:8] if len(stats) > 2 else None
+
+        return duration, view_count, upload_date
+
+    def _extract_title(self, page):
+        title_elem = page.get('title')
+        if title_elem and title_elem.get_text(strip=True):
+            return title_elem.get_text(strip=True)
+        # Fallback to use a default title if h1 is empty or missing
+        return 'Untitled'
+
+    def _extract_description(self, page):
+        description_elem = page.get('description')
+        return description_elem.get_text(strip=True) if description_elem else None
+
+    def _extract_thumbnail(self, page):
+        thumbnail_elem = page.get('thumbnail')
+        return thumbnail_elem['content'] if thumbnail_elem else None
+
+
+class HypnotubeGalleryIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubeGalleryIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubeGalleryIE._VALID_URL
+    _CACHED_ITEM_ARGS = ('gallery_thumbnails',)
+
+    def _real_extract(self, url):
+        gallery_id = self._match_id(url)
+
+        gallery = self._load_cached_item(gallery_id)
+        comments_page = None
+        if not gallery:
+            comments_page = self._prefetch_comments_page(gallery_id)
+            gallery = self._store_cached_item(gallery_id, self._extract_gallery(url, gallery_id))
+
+        # Shared metadata
+        common_metadata = {
+            'media_type': "Gallery",
+            'HYPNOTUBE_gallery': "Gallery",
+            'HYPNOTUBE_gallery_id': gallery_id,
+            'HYPNOTUBE_gallery_title': gallery['title'],
+            'uploader': gallery['uploader'],
+            'uploader_id': gallery['uploader_id'],
+            'uploader_url': gallery['uploader_url'],
+            'upload_date': gallery['upload_date'],
+            'view_count': gallery['view_count'],
+        }
+
+        # yt-dlp does not run __post_extractor for playlists, so requested comments are collected right away
+        get_comments = self.extract_comments(gallery_id, comments_page)
+
+        # Return the images as a playlist with additional metadata
+        return {
+            '_type': 'playlist',
+            'id': gallery_id,
+            'title': gallery['title'],
+            'description': gallery['description'],
+            # Every image entry is built when yt-dlp first asks for it
+            'entries': InAdvancePagedList(
+                functools.partial(self._build_image_page, gallery_id, gallery, common_metadata), len(gallery['images']), 1),
+            **common_metadata,
+            **(get_comments() if get_comments else {}),
+        }
+
+    @_timed_phase
+    def _extract_gallery(self, url, gallery_id):
+        """Metadata and [high-res URL, thumbnail URL or None] pairs of a gallery
+
+        The "?image=1" page has both the high-res URLs and the metadata, so the base page is only downloaded
+        for thumbnails with --extractor-args "hypnotube:gallery_thumbnails=true", or if the metadata is missing.
+        """
+        # Ensure the URL does not have any image parameter for consistent low-res extraction
+        base_url = _GALLERY_IMAGE_PARAM_RE.sub('', url)
+        want_thumbnails = self._hypnotube_arg('gallery_thumbnails', 'false') == 'true'
+        low_res_page = self._submit(self._download_webpage, base_url, gallery_id) if want_thumbnails else None
+
+        # Download high-resolution webpage and extract image URLs
+        high_res_webpage = self._download_webpage(f'{base_url}?image=1', gallery_id)
+        high_res_image_urls = _GALLERY_IMAGE_URL_RE.findall(high_res_webpage)
+        page = self._parse_item_page(high_res_webpage)
+
+        if low_res_page or not page.get('title'):
+            # Low-resolution webpage for thumbnail URLs and metadata
+            low_res_webpage = low_res_page.result() if low_res_page else self._download_webpage(
+                base_url, gallery_id, note='Downloading gallery metadata')
+            page = self._parse_item_page(low_res_webpage)
+
+        low_res_images = []
+        if want_thumbnails:
+            for gallery_item in page['gallery_items']:
+                for img_tag in gallery_item.select('a img'):
+                    low_res_images.append(img_tag['src'])
+
+        # Extract metadata
+        uploader_id, uploader_name, uploader_url = self._extract_uploader_info(page)
+        duration, view_count, upload_date = self._extract_video_stats(page)
+        return {
+            'title': self._extract_title(page),
+            'description': self._extract_description(page),
+            'uploader': uploader_name,
+            'uploader_id': uploader_id,
+            'uploader_url': uploader_url,
+            'upload_date': upload_date,
+            'view_count': view_count,
+            'images': list(zip(high_res_image_urls, low_res_images)) if low_res_images else [
+                [high_res_img, None] for high_res_img in high_res_image_urls],
+        }
+
+    def _build_image_page(self, gallery_id, gallery, common_metadata, idx):
+        high_res_img, low_res_img = gallery['images'][idx]
+        # Both high and low resolution as formats
+        formats = [{
+            'format_id': 'high',
+            'url': high_res_img,
+            'ext': high_res_img.split('.')[-1].split('?')[0],
+            'preference': 0,  # Higher preference for high-res
+        }]
+        if low_res_img:
+            formats.append({
+                'format_id': 'thumbnail',
+                'url': low_res_img,
+                'ext': low_res_img.split('.')[-1].split('?')[0],
+                'preference': -10,  # Lower preference for low-res
+            })
+        return [{
+            'id': f'{gallery_id}_{idx + 1}',
+            'title': gallery['title'],
+            'formats': formats,
+            **common_metadata,
+        }]
+
+
+class HypnotubeVideoIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubeVideoIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubeVideoIE._VALID_URL
+    _CACHED_ITEM_ARGS = ('probe_filesize',)
+
+    def _real_extract(self, url):
+        video_id_match = self._match_valid_url(url)
+        video_id = video_id_match.group('id')
+        cached = self._load_cached_item(video_id)
+        if cached:
+            return {**cached, '__post_extractor': self.extract_comments(video_id)}
+
+        # The comments URL only needs the ID, so it is downloaded while the watch page is
+        comments_page = self._prefetch_comments_page(video_id)
+        webpage = self._download_webpage(url, video_id)
+        page = self._parse_item_page(webpage)
+
+        uploader_id, uploader_name, uploader_url = self._extract_uploader_info(page)
+        title = self._extract_title(page)
+        description = self._extract_description(page)
+        duration, view_count, upload_date = self._extract_video_stats(page)
+        formats = self._extract_formats(page, url)
+        if self._hypnotube_arg('probe_filesize', 'false') == 'true':
+            self._probe_formats(video_id, formats)
+        thumbnail = self._extract_thumbnail(page)
+
+        info = self._store_cached_item(video_id, {
+            'id': video_id,
+            'title': title,
+            'uploader': uploader_name,
+            'uploader_id': uploader_id,
+            'uploader_url': uploader_url,
+            'upload_date': upload_date,
+            'duration': duration,
+            'view_count': view_count,
+            'formats': formats,
+            'thumbnail': thumbnail,
+            'description': description,
+        })
+        return {**info, '__post_extractor': self.extract_comments(video_id, comments_page)}
+
+    @_timed_phase
+    def _extract_formats(self, page, url):
+        # Check for new format video element
+        new_video_elem = page.get('plyr_player')
+        if new_video_elem:
+            formats = self._extract_new_format(new_video_elem, url)
+        else:
+            # Fallback to the old format video element ('thisPlayer')
+            old_video_elem = page.get('thisPlayer')
+            if old_video_elem:
+                formats = self._extract_old_format(old_video_elem, url)
+            else:
+                # If no video element is found, check for notice or raise an error
+                notice_elem = page.get('notice_overl') or page.get('playerOverlay')
+                if notice_elem:
+                    notice_text = notice_elem.get_text(strip=True)
+                    raise ExtractorError(f"Video cannot be accessed, HypnoTube says: {notice_text}", expected=True)
+                raise ExtractorError(f"Could not find video element on the page: {url}")
+
+        return formats
+
+    @_timed_phase
+    def _probe_formats(self, video_id, formats):
+        """Fill in filesize and ext of all formats at once, with a HEAD or single byte request per format URL
+
+        Enabled with --extractor-args "hypnotube:probe_filesize=true", so that -S filesize and --max-filesize
+        work without downloading. Results are kept per URL, and a URL is only valid as long as its signature.
+        """
+        probes = [(fmt, self._submit(self._probe_format, video_id, fmt)) for fmt in formats]
+        for fmt, probe in probes:
+            fmt.update(probe.result())
+
+    def _probe_format(self, video_id, fmt):
+        with _FORMAT_PROBES_LOCK:
+            if fmt['url'] in _FORMAT_PROBES:
+                _FORMAT_PROBES.move_to_end(fmt['url'])
+                return _FORMAT_PROBES[fmt['url']]
+
+        headers = fmt.get('http_headers') or {}
+        filesize, content_type = None, None
+        urlh = self._request_webpage(
+            HEADRequest(fmt['url'], headers=headers), video_id, note=False, errnote=False, fatal=False)
+        if urlh:
+            filesize = int_or_none(urlh.headers.get('Content-Length'))
+            content_type = urlh.headers.get('Content-Type')
+        if not filesize:
+            # Some servers do not answer HEAD requests; the total size of a one byte range is just as good
+            urlh = self._request_webpage(
+                fmt['url'], video_id, note=False, errnote=False, fatal=False, headers={**headers, 'Range': 'bytes=0-0'})
+            if urlh:
+                mobj = _CONTENT_RANGE_RE.match(urlh.headers.get('Content-Range') or '')
+                filesize = int(mobj.group('size')) if mobj else None
+                content_type = content_type or urlh.headers.get('Content-Type')
+                urlh.close()
+
+        mimetype = (content_type or '').split(';')[0].strip()
+        result = filter_dict({
+            'filesize': filesize,
+            'ext': mimetype2ext(mimetype) if mimetype.startswith(('video/', 'audio/')) else None,
+        })
+        with _FORMAT_PROBES_LOCK:
+            _FORMAT_PROBES[fmt['url']] = result
+            if len(_FORMAT_PROBES) > _FORMAT_PROBES_SIZE:
+                _FORMAT_PROBES.popitem(last=False)
+        return result
+
+    def _extract_new_format(self, video_elem, url):
+        formats = []
+        for source in video_elem.find_all('source'):
+            format_url = source.get('src')
+            format_size = source.get('sizes')
+
+            # Skip if no URL or size is found for the format
+            if not format_url or not format_size:
+                continue
+
+            # Set format preferences based on resolution or labels:
+            if format_size.isdigit():
+                format_size_int = int(format_size)
+                if format_size_int > 720:
+                    preference = 10  # High priority for resolutions above 720p
+                elif format_size_int == 720:
+                    preference = 5  # Same priority for 720p and 'HD'
+                else:
+                    preference = -5  # Lower priority for resolutions below 720p
+            else:
+                # Handle non-numeric labels: 'HD' same priority as 720p, 'SD' lower
+                format_size_lower = format_size.lower()
+                if format_size_lower == 'hd':
+                    preference = 5  # Same priority for 'HD' as 720p
+                elif format_size_lower == 'sd':
+                    preference = -10  # Lower priority for 'SD'
+                else:
+                    preference = -20  # Least priority for other non-numeric formats
+
+            formats.append({
+                'url': format_url,
+                'format_id': format_size,
+                'ext': 'mp4',
+                'preference': preference,
+                'http_headers': {'Referer': 'https://hypnotube.com/index.php'}
+            })
+        return formats
+
+    def _extract_old_format(self, video_elem, url):
+        formats = []
+        for source in video_elem.find_all('source'):
+            format_url = source.get('src')
+            format_label = source.get('label')
+
+            # Skip if no URL or label is found for the format
+            if not format_url or not format_label:
+                continue
+
+            # Set preference based on label (old format usually had 'HD' and 'SD' labels)
+            preference = -10 if format_label.lower() == 'sd' else 0
+
+            formats.append({
+                'url': format_url,
+                'format_id': format_label,
+                'ext': 'mp4',
+                'preference': preference,
+                'http_headers': {'Referer': 'https://hypnotube.com/index.php'}
+            })
+
+        return formats
+
+
+
+class HypnotubePlaylistIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubePlaylistIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubePlaylistIE._VALID_URL
+
+    def _real_extract(self, url):
+        mobj = self._match_valid_url(url)
+        playlist_id = mobj.group('id')
+        slug = mobj.group('slug')
+
+        # The first page is needed up front for the playlist title, later pages are only fetched on demand
+        first_page, urlh = self._download_cached_webpage_handle(url, playlist_id, note='Downloading page 1')
+        if urlh.url != url:
+            self.report_warning(f'Playlist {playlist_id} appears to be invalid, redirected to a different page.')
+            first_page = None
+        playlist_title = None
+        if first_page is not None:
+            playlist_title = self._html_search_regex(r'<h1[^>]*>(.+?)</h1>', first_page, 'playlist title', default=None)
+
+        entries = self._paged_listing(
+            functools.partial(self._download_page, playlist_id, slug, first_page), self._parse_page,
+            source=f'playlist_{playlist_id}')
+        return self.playlist_result(entries, playlist_id, playlist_title or f'Playlist {playlist_id}')
+
+    def _download_page(self, playlist_id, slug, first_page, page_num):
+        if page_num == 1:
+            return first_page
+        page_url = f'https://hypnotube.com/playlist/{playlist_id}/{slug}/page{page_num}.html'
+        return self._download_listing_page(page_url, playlist_id, page_num, note=f'Downloading page {page_num}')
+
+    def _parse_page(self, webpage, page_num):
+        return list(self._entries(webpage))
+
+    def _entries(self, webpage):
+        for entry in self._scan_listing_tiles(webpage, kinds=('video',)):
+            parsed_url = urlparse(entry['url'])
+            entry['url'] = urlunparse((parsed_url.scheme, parsed_url.netloc, parsed_url.path, '', '', ''))
+            yield entry
+
+
+class HypnotubeFavoritesIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubeFavoritesIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubeFavoritesIE._VALID_URL
+
+    def _download_page(self, user_id, page_num):
+        favorites_url = f'https://hypnotube.com/favorites/page{page_num}.html'
+        return self._download_listing_page(favorites_url, user_id, page_num, note=f'Downloading favorites page {page_num}')
+
+    def _parse_page(self, webpage, page_num):
+        # Video and gallery links in the order they appear on the page
+        combined_links = list(self._scan_listing_tiles(webpage))
+
+        if not combined_links and page_num == 1:
+            self.report_warning("No videos or galleries found on the favorites page. Possible login or cookie issues.")
+
+        return combined_links
+
+    def _real_extract(self, url):
+        user_id = 'favorite'
+        logged_in_username = self._get_logged_in_username()
+        if not logged_in_username:
+            # Favorites belong to an account, so a shared key would mix up the crawls of different ones
+            self.write_debug('Logged in user is unknown, not using crawl checkpoints or incremental crawls')
+        entries = self._paged_listing(
+            functools.partial(self._download_page, user_id), self._parse_page,
+            source=logged_in_username and f'favorites_{logged_in_username}')
+        return self.playlist_result(
+            entries, playlist_id=user_id, playlist_title=f"{logged_in_username or 'Unknown'} - Favorites")
+
+
+class HypnotubeUserIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubeUserIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubeUserIE._VALID_URL
+
+    def _download_page(self, user_id, content_type, page_num):
+        if content_type == '?photos=1':
+            user_url = f'https://hypnotube.com/uploads-by-user/{user_id}/page{page_num}.html{content_type}'
+        else:
+            user_url = f'https://hypnotube.com/uploads-by-user/{user_id}/page{page_num}.html'
+
+        return self._download_listing_page(user_url, user_id, page_num, note=f'Downloading user page {page_num} ({content_type})')
+
+    def _parse_page(self, content_type, webpage, page_num):
+        # Photo pages list galleries, the other pages list videos
+        kind = 'galleries' if content_type == '?photos=1' else 'video'
+        return list(self._scan_listing_tiles(webpage, kinds=(kind,)))
+
+    def _entries(self, user_id, content_type, seen=None):
+        return self._paged_listing(
+            functools.partial(self._download_page, user_id, content_type),
+            functools.partial(self._parse_page, content_type),
+            source=f'user_{user_id}_{"photos" if content_type else "videos"}', seen=seen)
+
+    def _real_extract(self, url):
+        mobj = self._match_valid_url(url)
+        user_id = mobj.group('id') or mobj.group('id1')
+
+        if '?photos=1' in url:
+            entries = self._entries(user_id, content_type='?photos=1')
+            return self.playlist_result(entries, user_id)
+
+        elif 'uploads-by-user' in url:
+            entries = self._entries(user_id, content_type='')
+            return self.playlist_result(entries, user_id)
+
+        else:
+            # Photos first, then videos; the video pages are only fetched once all photos have been consumed
+            seen = _ItemIdSet()
+            entries = itertools.chain(
+                self._entries(user_id, content_type='?photos=1', seen=seen),
+                self._entries(user_id, content_type='', seen=seen))
+            return self.playlist_result(entries, user_id)
+
+
+class HypnotubeChannelsIE(HypnotubeBaseIE):
+    IE_NAME = _lazy.HypnotubeChannelsIE.IE_NAME
+    _VALID_URL = _lazy.HypnotubeChannelsIE._VALID_URL
+
+    def _download_page(self, channel_id, channel_name, page_num):
+        channel_url = f'https://hypnotube.com/channels/{channel_id}/{channel_name}/page{page_num}.html'
+        return self._download_listing_page(channel_url, channel_id, page_num, note=f'Downloading channel page {page_num}')
+
+    def _parse_page(self, webpage, page_num):
+        # Video and gallery links in the order they appear on the page
+        combined_links = list(self._scan_listing_tiles(webpage))
+
+        if not combined_links and page_num == 1:
+            self.report_warning("No videos or galleries found on the channel page.")
+
+        return combined_links
+
+    def _real_extract(self, url):
+        mobj = self._match_valid_url(url)
+        channel_id = mobj.group('id')
+        channel_name = mobj.group('name')
+        entries = self._paged_listing(
+            functools.partial(self._download_page, channel_id, channel_name), self._parse_page,
+            source=f'channel_{channel_id}')
+        return self.playlist_result(entries, playlist_id=channel_id, playlist_title=f"Channel: {channel_name}")
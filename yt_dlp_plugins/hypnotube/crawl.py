@@ -0,0 +1,287 @@
+"""Crawl Hypnotube listings with several worker processes
+
+The pages of every listing, and with --items the videos and galleries on them, are shared out to worker
+processes through a SQLite work queue. Workers lease their tasks, so the task of a worker that dies is handed
+to another one once its lease runs out. When all tasks are done, the results are merged in listing order
+without duplicates and written as newline-delimited JSON. Any yt-dlp option can be passed along:
+
+    python -m yt_dlp_plugins.hypnotube.crawl --workers 8 --items -o channels.ndjson \\
+        "https://hypnotube.com/channels/38/hd/" "https://hypnotube.com/channels/5/amateur/"
+
+The queue is kept in --db, so an interrupted crawl continues where it stopped when it is run again.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import yt_dlp
+
+from .export import finalize_item
+
+_USER_RE = re.compile(r'https?://(?:www\.)?hypnotube\.com/user/.+-(?P<id>\d+)/?$')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sources (
+    idx INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    end_page INTEGER  -- First page past the end of the listing, once known
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,  -- "page" or "item"
+    source INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    ie_key TEXT,
+    item_id TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',  -- pending, leased, done, failed or skipped
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS page_tasks ON tasks (source, page) WHERE kind = 'page';
+CREATE UNIQUE INDEX IF NOT EXISTS item_tasks ON tasks (ie_key, item_id) WHERE kind = 'item';
+CREATE INDEX IF NOT EXISTS open_tasks ON tasks (state, kind);
+'''
+
+
+def expand_sources(urls):
+    """The combined photos and videos page of a user is crawled as its two listings, photos first"""
+    for url in urls:
+        mobj = _USER_RE.match(url)
+        if mobj:
+            yield f'https://hypnotube.com/uploads-by-user/{mobj.group("id")}/page1.html?photos=1'
+            yield f'https://hypnotube.com/uploads-by-user/{mobj.group("id")}/'
+        else:
+            yield url
+
+
+class WorkQueue:
+    """Page and item tasks of a crawl, shared by all its processes through a SQLite database
+
+    `window` pages of every listing are queued at a time; finishing a page queues the `window` pages after
+    it that are not queued yet, until a page past the end of the listing is found. A page that fails for good
+    queues none, so that a listing whose pages keep failing, past its end or not, runs out of tasks.
+    """
+
+    def __init__(self, path, window=1, lease_seconds=300, max_attempts=3):
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.executescript(_SCHEMA)
+        self._window = window
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+
+    def close(self):
+        self._db.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def add_sources(self, urls):
+        with self._transaction() as db:
+            known = [row['url'] for row in db.execute('SELECT url FROM sources ORDER BY idx')]
+            if known and known != urls:
+                raise ValueError('The database belongs to a crawl of other URLs; use another --db')
+            if known:
+                return
+            for idx, url in enumerate(urls):
+                db.execute('INSERT INTO sources (idx, url) VALUES (?, ?)', (idx, url))
+                db.executemany(
+                    'INSERT INTO tasks (kind, source, page, url) VALUES (?, ?, ?, ?)',
+                    [('page', idx, page, url) for page in range(1, self._window + 1)])
+
+    def lease(self, worker):
+        """Return the next task for worker, or None if no task is available right now"""
+        now = time.time()
+        with self._transaction() as db:
+            # Pages first, so that items are discovered as early as possible
+            task = db.execute('''
+                SELECT * FROM tasks WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)
+                ORDER BY kind = 'page' DESC, source, page, id LIMIT 1''', (now,)).fetchone()
+            if task is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now + self._lease_seconds, task['id']))
+        return dict(task, worker=worker)
+
+    def has_open_tasks(self):
+        return self._db.execute(
+            "SELECT EXISTS (SELECT 1 FROM tasks WHERE state IN ('pending', 'leased'))").fetchone()[0]
+
+    def _finish(self, db, task, result):
+        """Store the result of a task, unless its lease was lost to another worker meanwhile"""
+        return db.execute(
+            "UPDATE tasks SET state = 'done', result = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+            (json.dumps(result), task['id'], task['worker'])).rowcount
+
+    def complete_page(self, task, entries, with_items=False):
+        """entries: the entries of the page; None or an empty list past the end of the listing"""
+        source, page = task['source'], task['page']
+        with self._transaction() as db:
+            if not self._finish(db, task, entries or None):
+                return
+            if not entries:
+                db.execute(
+                    'UPDATE sources SET end_page = MIN(COALESCE(end_page, ?), ?) WHERE idx = ?', (page, page, source))
+                db.execute(
+                    "UPDATE tasks SET state = 'skipped' WHERE kind = 'page' AND source = ? AND page > ? AND state = 'pending'",
+                    (source, page))
+                return
+
+            self._queue_next_pages(db, task)
+            if with_items:
+                db.executemany(
+                    'INSERT OR IGNORE INTO tasks (kind, source, page, url, ie_key, item_id) VALUES (?, ?, ?, ?, ?, ?)',
+                    [('item', source, page, entry['url'], entry['ie_key'], entry['id']) for entry in entries if entry])
+
+    def complete_item(self, task, info):
+        with self._transaction() as db:
+            self._finish(db, task, info)
+
+    def fail(self, task, error):
+        """Give the task back to the queue, or mark it failed once it has used up its attempts"""
+        state = 'failed' if task['attempts'] + 1 >= self._max_attempts else 'pending'
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET state = ?, result = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (state, json.dumps({'error': error}), task['id'], task['worker']))
+
+    def _queue_next_pages(self, db, task):
+        """Queue the `window` pages after the page of task, so that the next page finished after a failed
+        one queues the pages after the failed one"""
+        end_page = db.execute('SELECT end_page FROM sources WHERE idx = ?', (task['source'],)).fetchone()[0]
+        last_page = task['page'] + self._window
+        if end_page is not None:
+            last_page = min(last_page, end_page - 1)
+        db.executemany(
+            'INSERT OR IGNORE INTO tasks (kind, source, page, url) VALUES (?, ?, ?, ?)',
+            [('page', task['source'], page, task['url']) for page in range(task['page'] + 1, last_page + 1)])
+
+    def failed_tasks(self):
+        return self._db.execute(
+            "SELECT kind, url, page, item_id, result FROM tasks WHERE state = 'failed' ORDER BY id").fetchall()
+
+    def merged_results(self, with_items=False):
+        """Entries of all listings in order, every item only once; with_items gives the extracted items instead"""
+        seen = set()
+        for source in self._db.execute('SELECT idx, end_page FROM sources ORDER BY idx').fetchall():
+            pages = self._db.execute('''
+                SELECT result FROM tasks WHERE kind = 'page' AND source = ? AND state = 'done' AND page < ?
+                ORDER BY page''', (source['idx'], source['end_page'] or sys.maxsize))
+            for page in pages:
+                for entry in json.loads(page['result']) or []:
+                    key = entry and (entry['ie_key'], entry['id'])
+                    if not key or key in seen:
+                        continue
+                    seen.add(key)
+                    if not with_items:
+                        yield entry
+                        continue
+                    item = self._db.execute(
+                        "SELECT result FROM tasks WHERE kind = 'item' AND ie_key = ? AND item_id = ? AND state = 'done'",
+                        key).fetchone()
+                    if item:
+                        yield json.loads(item['result'])
+
+
+def _strip_private(info):
+    return {key: value for key, value in info.items() if not key.startswith('__')}
+
+
+def _work(db_path, yt_dlp_args, worker, with_items, window, lease_seconds, max_attempts):
+    """Worker process: run tasks until the queue has no open tasks left"""
+    _, _, _, ydl_opts = yt_dlp.parse_options(yt_dlp_args)
+    ydl_opts.update({'extract_flat': 'in_playlist', 'ignoreerrors': False})
+    queue = WorkQueue(db_path, window, lease_seconds, max_attempts)
+    listings = {}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        while True:
+            task = queue.lease(worker)
+            if task is None:
+                if not queue.has_open_tasks():
+                    break
+                time.sleep(0.5)  # Other workers may still queue pages or items
+                continue
+            try:
+                if task['kind'] == 'page':
+                    listing = listings.get(task['source'])
+                    if listing is None:
+                        result = ydl.extract_info(task['url'], download=False, process=False)
+                        listing = listings[task['source']] = result.get('entries')
+                        if not hasattr(listing, 'fetch_page'):
+                            raise ValueError(f'{task["url"]} is not a Hypnotube listing')
+                    entries = listing.fetch_page(task['page'])
+                    queue.complete_page(
+                        task, entries and [entry and _strip_private(entry) for entry in entries], with_items)
+                else:
+                    info = ydl.extract_info(task['url'], download=False, process=False, ie_key=task['ie_key'])
+                    queue.complete_item(task, finalize_item(ydl, info))
+            except Exception as e:
+                queue.fail(task, str(e))
+    queue.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0], epilog='Other arguments are passed to yt-dlp')
+    parser.add_argument('-o', '--output', default='-', help='File the results are written to, "-" for stdout (default)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+    parser.add_argument('--db', default='hypnotube-crawl.sqlite', help='Work queue database (default: %(default)s)')
+    parser.add_argument('--items', action='store_true', help='Extract every video and gallery instead of only listing them')
+    parser.add_argument('--lease', type=int, default=300, help='Seconds before the task of an unresponsive worker is retried')
+    parser.add_argument('--attempts', type=int, default=3, help='Attempts per task before it is given up')
+    args, yt_dlp_args = parser.parse_known_args(argv)
+
+    _, _, urls, _ = yt_dlp.parse_options(yt_dlp_args)
+    if not urls:
+        parser.error('no URL given')
+    workers = max(args.workers, 1)
+    window = workers * 2  # Pages of every listing queued at once
+
+    queue = WorkQueue(args.db, window, args.lease, args.attempts)
+    queue.add_sources(list(expand_sources(urls)))
+    processes = [
+        multiprocessing.Process(
+            target=_work, name=f'hypnotube-crawl-{n}',
+            args=(args.db, yt_dlp_args, f'{os.getpid()}-{n}', args.items, window, args.lease, args.attempts))
+        for n in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    count = 0
+    with contextlib.ExitStack() as stack:
+        f = sys.stdout if args.output == '-' else stack.enter_context(open(args.output, 'w', encoding='utf-8'))
+        for result in queue.merged_results(args.items):
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+
+    failed = queue.failed_tasks()
+    for task in failed:
+        print(f'Failed {task["kind"]} {task["item_id"] or task["page"]} of {task["url"]}: '
+              f'{json.loads(task["result"])["error"]}', file=sys.stderr)
+    print(f'[crawl] Wrote {count} {"items" if args.items else "entries"}, {len(failed)} tasks failed', file=sys.stderr)
+    queue.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Export the metadata of Hypnotube videos and galleries as newline-delimited JSON
+
+Every item is written as soon as it has been extracted and nothing is kept afterwards, so memory stays flat
+however large a user or channel is. Any yt-dlp option can be passed along, e.g. --cookies or --extractor-args:
+
+    python -m yt_dlp_plugins.hypnotube.export -o items.ndjson --comments-output comments.ndjson \\
+        --write-comments "https://hypnotube.com/channels/38/hd/"
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+import yt_dlp
+from yt_dlp.utils import PagedList
+
+# Playlists of these extractors are exported as one item instead of being walked
+_ITEM_PLAYLIST_EXTRACTORS = ('HypnotubeGallery',)
+
+
+def finalize_item(ydl, info):
+    """The info dict of an item extracted with process=False, with its comments and entries, ready for JSON"""
+    post_extractor = info.pop('__post_extractor', None)
+    if post_extractor:
+        info.update(post_extractor() or {})
+    if isinstance(info.get('entries'), PagedList):
+        info['entries'] = info['entries'].getslice()
+    return ydl.sanitize_info(info)
+
+
+class NDJSONExporter:
+    def __init__(self, ydl, items_file, comments_file=None):
+        self._ydl = ydl
+        self._items_file = items_file
+        self._comments_file = comments_file
+        self.item_count = self.comment_count = 0
+
+    def export(self, url):
+        result = self._ydl.extract_info(url, download=False, process=False)
+        if result:
+            self._export_result(result)
+
+    def _export_result(self, result):
+        if result.get('_type') in ('url', 'url_transparent'):
+            result = self._ydl.extract_info(
+                result['url'], download=False, process=False, ie_key=result.get('ie_key'))
+            if not result:  # Failed with --ignore-errors
+                return
+
+        if result.get('_type') == 'playlist' and result.get('extractor_key') not in _ITEM_PLAYLIST_EXTRACTORS:
+            # Unlike indexing, iterating a Hypnotube listing does not keep its pages. PagedList.__bool__ fetches
+            # and keeps the first page, so the entries are not tested for truth
+            entries = result.get('entries')
+            for entry in entries if entries is not None else []:
+                if entry:
+                    self._export_result(entry)
+            return
+
+        self._write_item(result)
+
+    def _write_item(self, info):
+        info = finalize_item(self._ydl, info)
+        comments = info.pop('comments', None) if self._comments_file else None
+        self._write_line(self._items_file, info)
+        self.item_count += 1
+        for comment in comments or []:
+            self._write_line(self._comments_file, {
+                'item_id': info.get('id'),
+                'extractor_key': info.get('extractor_key'),
+                **comment,
+            })
+            self.comment_count += 1
+
+    def _write_line(self, f, obj):
+        f.write(json.dumps(obj, ensure_ascii=False, default=repr) + '\n')
+        f.flush()
+
+
+def _open_output(path, stack):
+    if path == '-':
+        return sys.stdout
+    return stack.enter_context(open(path, 'a', encoding='utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0], epilog='Other arguments are passed to yt-dlp')
+    parser.add_argument(
+        '-o', '--output', default='-', help='File the items are appended to, "-" for stdout (default)')
+    parser.add_argument(
+        '--comments-output', help='Write comments to this file, one per line, instead of into their items')
+    args, yt_dlp_args = parser.parse_known_args(argv)
+
+    _, _, urls, ydl_opts = yt_dlp.parse_options(yt_dlp_args)
+    if not urls:
+        parser.error('no URL given')
+    ydl_opts.update({
+        'extract_flat': 'in_playlist',
+        'lazy_playlist': True,
+        # Keep stdout for the items when they are written there
+        'logtostderr': args.output == '-',
+    })
+
+    with contextlib.ExitStack() as stack:
+        ydl = stack.enter_context(yt_dlp.YoutubeDL(ydl_opts))
+        exporter = NDJSONExporter(
+            ydl, _open_output(args.output, stack),
+            args.comments_output and _open_output(args.comments_output, stack))
+        for url in urls:
+            try:
+                exporter.export(url)
+            except yt_dlp.utils.DownloadError:
+                if ydl_opts.get('ignoreerrors') is not True:
+                    return 1
+        ydl.to_screen(f'[export] Exported {exporter.item_count} items and {exporter.comment_count} comments')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from yt_dlp.networking import HEADRequest, Request
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp.utils import PostProcessingError, format_bytes, int_or_none
+
+
+class HypnotubeGalleryDownloadPP(PostProcessor):
+    """Download all images of a Hypnotube gallery at once, instead of one playlist entry after another
+
+    yt-dlp only has to resolve the image entries, so this is meant to be used with --skip-download:
+        yt-dlp --skip-download --use-postprocessor "HypnotubeGalleryDownload:when=playlist;workers=8" URL
+    The images are written to the paths given by the output template. Files that already exist with the size
+    the server reports are skipped. Connections are kept alive when yt-dlp uses its "requests" request handler.
+    """
+    _CHUNK_SIZE = 64 * 1024
+    _PROGRESS_INTERVAL = 1  # Seconds between progress lines
+
+    def __init__(self, downloader=None, workers=8, **kwargs):
+        super().__init__(downloader)
+        self._workers = max(int_or_none(workers) or 1, 1)
+
+    def run(self, info):
+        if info.get('extractor_key') != 'HypnotubeGallery':
+            return [], info
+
+        downloads = [
+            download for entry in info.get('entries') or [] if entry
+            for download in entry.get('requested_downloads') or []
+            if download.get('url') and download.get('filepath')]
+        if not downloads:
+            return [], info
+
+        self.to_screen(f'Downloading {len(downloads)} images of gallery {info["id"]} with {self._workers} workers')
+        done = skipped = total_bytes = failed = 0
+        last_report = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='hypnotube-gallery') as pool:
+            futures = {pool.submit(self._download_image, download): download for download in downloads}
+            for future in as_completed(futures):
+                try:
+                    size, was_skipped = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.report_warning(f'Unable to download {futures[future]["url"]}: {e}')
+                    continue
+                done += 1
+                skipped += was_skipped
+                total_bytes += size
+                if time.monotonic() - last_report >= self._PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    self.to_screen(f'{done + failed}/{len(downloads)} images, {format_bytes(total_bytes)}')
+
+        self.to_screen(
+            f'Finished gallery {info["id"]}: {done - skipped} images ({format_bytes(total_bytes)}) downloaded, '
+            f'{skipped} already present, {failed} failed')
+        if failed:
+            raise PostProcessingError(f'{failed} images of gallery {info["id"]} could not be downloaded')
+        return [], info
+
+    def _download_image(self, download):
+        """Return the number of bytes written and whether the file was already complete"""
+        filepath, headers = download['filepath'], download.get('http_headers') or {}
+        if os.path.isfile(filepath):
+            with self._downloader.urlopen(HEADRequest(download['url'], headers=headers)) as response:
+                size = int_or_none(response.headers.get('Content-Length'))
+            if size is not None and os.path.getsize(filepath) == size:
+                return 0, True
+
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        part_path = f'{filepath}.part'
+        size = 0
+        with self._downloader.urlopen(Request(download['url'], headers=headers)) as response, open(part_path, 'wb') as f:
+            while chunk := response.read(self._CHUNK_SIZE):
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(part_path, filepath)
+        return size, False